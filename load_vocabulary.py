@@ -6,9 +6,13 @@ Run with: uv run python load_vocabulary.py
 
 import asyncio
 import json
+from itertools import islice
 from pathlib import Path
 from src.mandarin_mcp_server.database import MandarinDatabase
 
+# Rows handed to the database per executemany/commit
+BATCH_SIZE = 1000
+
 
 async def load_vocabulary():
     """Load vocab from JSON file into database."""
@@ -28,32 +32,71 @@ async def load_vocabulary():
     await db.connect()
     await db.initialise_schema()
     
+    # Words already in the database are filtered out up front, so a re-run
+    # with nothing new does no inserts at all
+    existing = await db.get_vocabulary_keys()
+    
     # Load vocab for each HSK level
     total_added = 0
     
     for level_key, vocab_list in vocab_data.items():
         # Extract HSK level number from key (e.g., "hsk1" -> 1)
         hsk_level = int(level_key.replace("hsk", ""))
+        if not 1 <= hsk_level <= 6:
+            print(f"⚠️  Skipping {level_key}: HSK level must be between 1 and 6")
+            continue
         
-        print(f"Loading HSK {hsk_level} vocab...")
+        # Bad entries are reported and left out here, so one malformed word
+        # can't abort the bulk insert for the rest of the file
+        rows = []
+        already_loaded = 0
+        invalid = 0
         
         for vocab in vocab_list:
-            try:
-                await db.add_vocabulary(
-                    chinese=vocab["chinese"],
-                    pinyin=vocab["pinyin"],
-                    english=vocab["english"],
-                    hsk_level=hsk_level,
-                    word_type=vocab.get("word_type")
-                )
-                total_added += 1
-                print(f"  ✓ Added: {vocab['chinese']} ({vocab['pinyin']}) - {vocab['english']}")
-            except Exception as e:
-                # Skip duplicates
-                if "UNIQUE constraint failed" in str(e):
-                    print(f"  ⊘ Skipped duplicate: {vocab['chinese']}")
-                else:
-                    print(f"  ✗ Error adding {vocab['chinese']}: {e}")
+            chinese = vocab.get("chinese")
+            pinyin = vocab.get("pinyin")
+            english = vocab.get("english")
+            
+            if not (chinese and pinyin and english):
+                print(f"⚠️  HSK {hsk_level}: skipping entry missing chinese/pinyin/english: {vocab}")
+                invalid += 1
+            elif (chinese, hsk_level) in existing:
+                already_loaded += 1
+            else:
+                rows.append((
+                    chinese,
+                    pinyin,
+                    english,
+                    hsk_level,
+                    vocab.get("word_type"),
+                    vocab.get("example_sentence")
+                ))
+        
+        # Insert in fixed-size batches to cap the parameter list handed to each
+        # executemany and the size of each transaction. The whole file is still
+        # held in memory (json.load), so this doesn't bound total memory. The
+        # database ignores words repeated within the file.
+        added = 0
+        batches = iter(rows)
+        while batch := list(islice(batches, BATCH_SIZE)):
+            added += await db.add_vocabulary_bulk(batch)
+        total_added += added
+        
+        # One summary line per level rather than per word
+        notes = [
+            f"{count} {label}"
+            for count, label in (
+                (already_loaded, "already loaded"),
+                (len(rows) - added, "repeated in file"),
+                (invalid, "invalid"),
+            )
+            if count
+        ]
+        print(f"HSK {hsk_level}: +{added} items" + (f" ({', '.join(notes)})" if notes else ""))
+    
+    # Refresh planner statistics now the tables hold real data
+    if total_added:
+        await db.analyse()
     
     await db.close()
     
@@ -8,11 +8,69 @@ This module handles all SQLite database operations including:
 - Recording quiz results
 """
 
+import asyncio
+import random
 import aiosqlite
-import json
-from pathlib import Path
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Tuple, Set, AsyncIterator
+
+
+# HSK levels accepted for vocabulary (mirrors the CHECK constraint)
+_VALID_HSK_LEVELS = frozenset(range(1, 7))
+
+# Days until next review for each mastery level (0-5)
+REVIEW_INTERVAL_DAYS = (1, 3, 7, 14, 30, 60)
+
+# SQL CASE giving the review interval for an existing word's updated mastery level
+_NEXT_REVIEW_DAYS_SQL = (
+    "CASE MAX(0, MIN(5, mastery_level + ?)) "
+    + " ".join(
+        f"WHEN {level} THEN {days}" for level, days in enumerate(REVIEW_INTERVAL_DAYS)
+    )
+    + " END"
+)
+
+# Built once at import so every call hits the same cached prepared statement
+_UPSERT_PROGRESS_SQL = f"""
+    INSERT INTO user_progress 
+    (vocabulary_id, mastery_level, times_seen, times_correct, times_incorrect, 
+     last_reviewed, next_review)
+    VALUES (?, ?, 1, ?, ?, datetime('now'), datetime('now', '+1 day'))
+    ON CONFLICT(vocabulary_id) DO UPDATE SET
+        mastery_level = MAX(0, MIN(5, mastery_level + ?)),
+        times_seen = times_seen + 1,
+        times_correct = times_correct + excluded.times_correct,
+        times_incorrect = times_incorrect + excluded.times_incorrect,
+        last_reviewed = excluded.last_reviewed,
+        next_review = datetime(
+            excluded.last_reviewed, '+' || {_NEXT_REVIEW_DAYS_SQL} || ' days'
+        ),
+        updated_at = excluded.last_reviewed
+"""
+
+# Due-review feed, served by the covering idx_progress_due index.
+# Parameters: (now, limit)
+_WORDS_FOR_REVIEW_SQL = """
+    SELECT v.id, v.chinese, v.pinyin, v.english, v.hsk_level,
+           v.word_type, v.example_sentence,
+           up.mastery_level, up.times_seen, up.last_reviewed
+    FROM vocabulary v
+    INNER JOIN user_progress up ON v.id = up.vocabulary_id
+    WHERE up.next_review <= ?
+    ORDER BY up.next_review ASC
+    LIMIT ?
+"""
+
+
+def utc_timestamp() -> str:
+    """
+    Current UTC time in the format SQLite's datetime('now') produces.
+    
+    Review queries bind this rather than calling datetime('now') in SQL, so
+    the comparison against next_review is against a plain parameter.
+    """
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
 
 class MandarinDatabase:
@@ -26,29 +84,176 @@ class MandarinDatabase:
     - learning_sessions: Logs study sessions
     """
     
-    def __init__(self, db_path: str = "mandarin_learning.db"):
+    def __init__(self, db_path: str = "mandarin_learning.db", read_pool_size: int = 5):
         """
         Initialise database connection.
         
         Args:
             db_path: Path to the SQLite database file
+            read_pool_size: Number of extra read-only connections to keep open
+                (0 routes reads through the single writer connection)
         """
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
         self._connection: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._reader_queue: Optional[asyncio.Queue] = None
+        # Vocabulary rows grouped by HSK level, loaded on first use and
+        # dropped whenever vocabulary is added through this instance, or
+        # another connection (e.g. load_vocabulary.py) commits to the file
+        self._vocab_cache: Optional[Dict[int, List[aiosqlite.Row]]] = None
+        self._vocab_cache_lock = asyncio.Lock()
+        # Set when a transaction writes vocabulary; the cache is dropped once it commits
+        self._vocab_pending = False
+        # Bumped on every invalidation, so a load that overlaps one isn't kept
+        self._vocab_generation = 0
+        # Writer's PRAGMA data_version when the cache was last checked
+        self._vocab_data_version: Optional[int] = None
+        # The writer connection is shared by every concurrent tool call; the
+        # lock gives one transaction() at a time sole use of it
+        self._write_lock = asyncio.Lock()
+        self._transaction_owner: Optional[asyncio.Task] = None
     
-    async def connect(self) -> None:
-        """Establish connection to the database."""
-        self._connection = await aiosqlite.connect(self.db_path)
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """Open a connection with the standard PRAGMA setup applied."""
+        # sqlite3 keeps an LRU of prepared statements keyed by SQL text; the
+        # default of 128 is raised so every query in this package stays compiled
+        connection = await aiosqlite.connect(self.db_path, cached_statements=256)
+        # Rows support both index and column-name access, and convert straight to dicts
+        connection.row_factory = aiosqlite.Row
+        # WAL lets readers proceed during writes and avoids an fsync per commit
+        # when paired with synchronous=NORMAL. Journal mode persists in the file.
+        await connection.execute("PRAGMA journal_mode = WAL")
+        await connection.execute("PRAGMA synchronous = NORMAL")
+        # Keep temp tables/indices in memory, use a 16MB page cache and mmap reads
+        await connection.execute("PRAGMA temp_store = MEMORY")
+        await connection.execute("PRAGMA cache_size = -16000")
+        await connection.execute("PRAGMA mmap_size = 268435456")
         # Enable foreign keys for referential integrity
-        await self._connection.execute("PRAGMA foreign_keys = ON")
-        await self._connection.commit()
+        await connection.execute("PRAGMA foreign_keys = ON")
+        await connection.commit()
+        return connection
+    
+    async def connect(self) -> None:
+        """
+        Establish connection to the database.
+        
+        Opens one writer connection plus a pool of long-lived reader
+        connections. WAL allows the readers to run alongside the writer,
+        so concurrent tool calls don't queue behind each other.
+        """
+        self._connection = await self._open_connection()
+        
+        # In-memory databases are private to each connection, so they can't be pooled
+        if self.read_pool_size > 0 and self.db_path != ":memory:":
+            self._readers = [
+                await self._open_connection() for _ in range(self.read_pool_size)
+            ]
+            self._reader_queue = asyncio.Queue()
+            for reader in self._readers:
+                self._reader_queue.put_nowait(reader)
     
     async def close(self) -> None:
         """Close the database connection."""
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._reader_queue = None
+        
         if self._connection:
+            # Let SQLite refresh planner statistics that have drifted this session
+            await self._connection.execute("PRAGMA optimize")
             await self._connection.close()
             self._connection = None
     
+    async def analyse(self) -> None:
+        """
+        Rebuild query planner statistics for all tables and indices.
+        
+        Worth running after large bulk loads so joins and index choices
+        reflect the new data.
+        """
+        async with self.transaction():
+            await self._connection.execute("ANALYZE")
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        Group writes on the writer connection into one transaction.
+        
+        Holds the write lock for the whole block, so writes and commits from
+        other coroutines can't interleave with it: the block's writes are
+        committed together when it exits, or rolled back together if it
+        raises. Write methods called inside the block join it rather than
+        committing on their own, as do nested transaction() blocks.
+        
+        Usage:
+            async with db.transaction():
+                await db.record_quiz_answers(...)
+                await db.record_quiz_result(...)
+        """
+        task = asyncio.current_task()
+        if task is not None and self._transaction_owner is task:
+            # Already inside this task's transaction; the outermost block commits
+            yield
+            return
+        
+        async with self._write_lock:
+            self._transaction_owner = task
+            try:
+                yield
+                await self._connection.commit()
+            except BaseException:
+                await self._connection.rollback()
+                # Nothing reached the readers, so the cached vocab is still accurate
+                self._vocab_pending = False
+                raise
+            finally:
+                self._transaction_owner = None
+            
+            # Only drop cached vocab once new words are visible to the readers
+            if self._vocab_pending:
+                self._invalidate_vocab_cache()
+                self._vocab_pending = False
+    
+    @property
+    def vocab_generation(self) -> int:
+        """
+        Counter that changes whenever cached vocabulary is invalidated.
+        
+        Callers that cache output derived from vocabulary can key it on this
+        to be invalidated by the same hook.
+        """
+        return self._vocab_generation
+    
+    def _invalidate_vocab_cache(self) -> None:
+        """Drop the cached vocabulary so the next lookup reloads it."""
+        self._vocab_cache = None
+        self._vocab_generation += 1
+    
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Check out a connection for read-only queries.
+        
+        Reads made here run alongside writes on the writer connection rather
+        than queueing behind them. Falls back to the writer connection when
+        no reader pool is open (e.g. for :memory: databases).
+        
+        Usage:
+            async with db.reader() as conn:
+                cursor = await conn.execute(...)
+        """
+        if self._reader_queue is None:
+            yield self._connection
+            return
+        
+        connection = await self._reader_queue.get()
+        try:
+            yield connection
+        finally:
+            self._reader_queue.put_nowait(connection)
+    
     async def initialise_schema(self) -> None:
         """
         Create all database tables if they don't exist.
@@ -58,82 +263,137 @@ class MandarinDatabase:
         if not self._connection:
             raise RuntimeError("Database not connected. Call connect() first.")
         
-        # Vocab table: stores all HSK words and phrases
-        await self._connection.execute("""
-            CREATE TABLE IF NOT EXISTS vocabulary (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                chinese TEXT NOT NULL,
-                pinyin TEXT NOT NULL,
-                english TEXT NOT NULL,
-                hsk_level INTEGER NOT NULL CHECK(hsk_level BETWEEN 1 AND 6),
-                word_type TEXT,
-                example_sentence TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(chinese, hsk_level)
-            )
-        """)
-        
-        # User progress table: tracks learning progress for each word
-        await self._connection.execute("""
-            CREATE TABLE IF NOT EXISTS user_progress (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                vocabulary_id INTEGER NOT NULL,
-                mastery_level INTEGER DEFAULT 0 CHECK(mastery_level BETWEEN 0 AND 5),
-                times_seen INTEGER DEFAULT 0,
-                times_correct INTEGER DEFAULT 0,
-                times_incorrect INTEGER DEFAULT 0,
-                last_reviewed TIMESTAMP,
-                next_review TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (vocabulary_id) REFERENCES vocabulary(id) ON DELETE CASCADE,
-                UNIQUE(vocabulary_id)
-            )
-        """)
-        
-        # Quiz results table: records each quiz attempt
-        await self._connection.execute("""
-            CREATE TABLE IF NOT EXISTS quiz_results (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                quiz_type TEXT NOT NULL,
-                hsk_level INTEGER CHECK(hsk_level BETWEEN 1 AND 6),
-                total_questions INTEGER NOT NULL,
-                correct_answers INTEGER NOT NULL,
-                score_percentage REAL NOT NULL,
-                duration_seconds INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Learning sessions table: tracks study sessions
-        await self._connection.execute("""
-            CREATE TABLE IF NOT EXISTS learning_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_type TEXT NOT NULL,
-                items_studied INTEGER DEFAULT 0,
-                duration_seconds INTEGER,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        async with self.transaction():
+            # Vocab table: stores all HSK words and phrases
+            await self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS vocabulary (
+                    id INTEGER PRIMARY KEY,
+                    chinese TEXT NOT NULL,
+                    pinyin TEXT NOT NULL,
+                    english TEXT NOT NULL,
+                    hsk_level INTEGER NOT NULL CHECK(hsk_level BETWEEN 1 AND 6),
+                    word_type TEXT,
+                    example_sentence TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(chinese, hsk_level)
+                )
+            """)
+            
+            # User progress table: tracks learning progress for each word.
+            # Keyed directly by vocabulary_id (a rowid alias), so the table is a
+            # single B-tree with no separate UNIQUE index to maintain.
+            await self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS user_progress (
+                    vocabulary_id INTEGER PRIMARY KEY,
+                    mastery_level INTEGER DEFAULT 0 CHECK(mastery_level BETWEEN 0 AND 5),
+                    times_seen INTEGER DEFAULT 0,
+                    times_correct INTEGER DEFAULT 0,
+                    times_incorrect INTEGER DEFAULT 0,
+                    last_reviewed TIMESTAMP,
+                    next_review TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (vocabulary_id) REFERENCES vocabulary(id) ON DELETE CASCADE
+                )
+            """)
+            
+            # Quiz results table: records each quiz attempt
+            await self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS quiz_results (
+                    id INTEGER PRIMARY KEY,
+                    quiz_type TEXT NOT NULL,
+                    hsk_level INTEGER CHECK(hsk_level BETWEEN 1 AND 6),
+                    total_questions INTEGER NOT NULL,
+                    correct_answers INTEGER NOT NULL,
+                    score_percentage REAL NOT NULL,
+                    duration_seconds INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Learning sessions table: tracks study sessions
+            await self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS learning_sessions (
+                    id INTEGER PRIMARY KEY,
+                    session_type TEXT NOT NULL,
+                    items_studied INTEGER DEFAULT 0,
+                    duration_seconds INTEGER,
+                    notes TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Create indices for better query performance
+            await self._connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vocabulary_hsk 
+                ON vocabulary(hsk_level)
+            """)
+            
+            # Word-type browsing filters on word_type (and optionally hsk_level) and
+            # sorts by hsk_level, chinese, so both variants read the index in order
+            await self._connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vocabulary_type 
+                ON vocabulary(word_type, hsk_level, chinese)
+            """)
+            
+            await self._connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_progress_mastery 
+                ON user_progress(mastery_level)
+            """)
+            
+            # Covering index for the due-review feed: range scan on next_review and
+            # the joined progress columns are read straight from the index.
+            # Supersedes the old single-column idx_progress_next_review.
+            await self._connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_progress_due 
+                ON user_progress(next_review, vocabulary_id, mastery_level, times_seen, last_reviewed)
+            """)
+            
+            await self._connection.execute("DROP INDEX IF EXISTS idx_progress_next_review")
+            
+            # Full-text index over vocabulary for search_vocabulary. The trigram
+            # tokenizer matches substrings (as LIKE '%term%' did) for terms of three
+            # or more characters; triggers keep it in step with the vocabulary table.
+            cursor = await self._connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'vocabulary_fts'"
             )
-        """)
-        
-        # Create indices for better query performance
-        await self._connection.execute("""
-            CREATE INDEX IF NOT EXISTS idx_vocabulary_hsk 
-            ON vocabulary(hsk_level)
-        """)
-        
-        await self._connection.execute("""
-            CREATE INDEX IF NOT EXISTS idx_progress_mastery 
-            ON user_progress(mastery_level)
-        """)
-        
-        await self._connection.execute("""
-            CREATE INDEX IF NOT EXISTS idx_progress_next_review 
-            ON user_progress(next_review)
-        """)
-        
-        await self._connection.commit()
+            fts_exists = await cursor.fetchone() is not None
+            
+            await self._connection.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS vocabulary_fts USING fts5(
+                    chinese, pinyin, english,
+                    content='vocabulary', content_rowid='id', tokenize='trigram'
+                )
+            """)
+            
+            await self._connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS vocabulary_fts_insert AFTER INSERT ON vocabulary BEGIN
+                    INSERT INTO vocabulary_fts(rowid, chinese, pinyin, english)
+                    VALUES (new.id, new.chinese, new.pinyin, new.english);
+                END
+            """)
+            
+            await self._connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS vocabulary_fts_delete AFTER DELETE ON vocabulary BEGIN
+                    INSERT INTO vocabulary_fts(vocabulary_fts, rowid, chinese, pinyin, english)
+                    VALUES ('delete', old.id, old.chinese, old.pinyin, old.english);
+                END
+            """)
+            
+            await self._connection.execute("""
+                CREATE TRIGGER IF NOT EXISTS vocabulary_fts_update AFTER UPDATE ON vocabulary BEGIN
+                    INSERT INTO vocabulary_fts(vocabulary_fts, rowid, chinese, pinyin, english)
+                    VALUES ('delete', old.id, old.chinese, old.pinyin, old.english);
+                    INSERT INTO vocabulary_fts(rowid, chinese, pinyin, english)
+                    VALUES (new.id, new.chinese, new.pinyin, new.english);
+                END
+            """)
+            
+            # Databases created before the index existed need it filled once
+            if not fts_exists:
+                await self._connection.execute(
+                    "INSERT INTO vocabulary_fts(vocabulary_fts) VALUES ('rebuild')"
+                )
     
     async def add_vocabulary(
         self,
@@ -161,48 +421,164 @@ class MandarinDatabase:
         Raises:
             ValueError: If HSK level is not between 1 and 6
         """
-        if not 1 <= hsk_level <= 6:
+        if hsk_level not in _VALID_HSK_LEVELS:
             raise ValueError(f"HSK level must be between 1 and 6, got {hsk_level}")
         
-        cursor = await self._connection.execute(
-            """
-            INSERT INTO vocabulary 
-            (chinese, pinyin, english, hsk_level, word_type, example_sentence)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (chinese, pinyin, english, hsk_level, word_type, example_sentence)
-        )
-        await self._connection.commit()
+        async with self.transaction():
+            cursor = await self._connection.execute(
+                """
+                INSERT INTO vocabulary 
+                (chinese, pinyin, english, hsk_level, word_type, example_sentence)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (chinese, pinyin, english, hsk_level, word_type, example_sentence)
+            )
+            self._vocab_pending = True
         return cursor.lastrowid
     
+    async def add_vocabulary_bulk(
+        self,
+        rows: List[Tuple[str, str, str, int, Optional[str], Optional[str]]]
+    ) -> int:
+        """
+        Add many vocab items in a single transaction.
+        
+        Rows the database rejects are skipped rather than raising. That covers
+        duplicates (same chinese + HSK level) but also missing chinese, pinyin
+        or english, so callers that need to report bad rows should check them
+        first; the return value alone can't tell the two apart.
+        
+        Args:
+            rows: Tuples of (chinese, pinyin, english, hsk_level,
+                word_type, example_sentence)
+        
+        Returns:
+            Number of vocab items actually inserted
+        
+        Raises:
+            ValueError: If any row has an HSK level not between 1 and 6
+        """
+        for row in rows:
+            if row[3] not in _VALID_HSK_LEVELS:
+                raise ValueError(f"HSK level must be between 1 and 6, got {row[3]}")
+        
+        async with self.transaction():
+            cursor = await self._connection.executemany(
+                """
+                INSERT OR IGNORE INTO vocabulary
+                (chinese, pinyin, english, hsk_level, word_type, example_sentence)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+            self._vocab_pending = True
+        return cursor.rowcount
+    
+    async def get_vocabulary_keys(self) -> Set[Tuple[str, int]]:
+        """
+        Get the (chinese, hsk_level) pairs already in the vocabulary table.
+        
+        Lets bulk loaders drop known rows before inserting them.
+        
+        Returns:
+            Set of (chinese, hsk_level) tuples
+        """
+        async with self.reader() as conn:
+            cursor = await conn.execute("SELECT chinese, hsk_level FROM vocabulary")
+            return {(row[0], row[1]) for row in await cursor.fetchall()}
+    
     async def get_vocabulary_by_hsk_level(
         self, 
         hsk_level: int,
         limit: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[aiosqlite.Row]:
         """
         Retrieve vocab for specific HSK level.
         
+        Served from an in-memory cache of all vocabulary. Rows are returned
+        as-is rather than copied into dicts, since whole levels are read for
+        quiz generation. They support row['column'] access; use dict(row)
+        where a mutable mapping is needed.
+        
         Args:
             hsk_level: HSK level to retrieve (1-6)
             limit: Maximum number of items to return
         
         Returns:
-            List of vocab dictionaries
+            List of vocab rows
         """
-        query = "SELECT * FROM vocabulary WHERE hsk_level = ?"
-        params = [hsk_level]
+        vocab_cache = await self._get_vocab_cache()
+        rows = vocab_cache.get(hsk_level, [])
         
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
+        # Slicing always returns a new list, so callers can't disturb the cache
+        return rows[:limit] if limit else rows[:]
+    
+    async def get_random_vocabulary_by_hsk_level(
+        self,
+        hsk_level: int,
+        count: int
+    ) -> List[aiosqlite.Row]:
+        """
+        Retrieve a random sample of vocab for specific HSK level.
         
-        cursor = await self._connection.execute(query, params)
-        rows = await cursor.fetchall()
+        Samples straight from the in-memory cache, so the level is neither
+        re-queried nor copied.
         
-        # Convert to list of dictionaries
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        Args:
+            hsk_level: HSK level to sample from (1-6)
+            count: Number of items to return (fewer if the level is smaller)
+        
+        Returns:
+            List of vocab rows in random order
+        """
+        vocab_cache = await self._get_vocab_cache()
+        rows = vocab_cache.get(hsk_level, [])
+        return random.sample(rows, min(count, len(rows)))
+    
+    async def _get_vocab_cache(self) -> Dict[int, List[aiosqlite.Row]]:
+        """
+        Load all vocabulary into memory, grouped by HSK level.
+        
+        Vocabulary only changes when words are loaded, so one query serves
+        every later per-level lookup until the cache is invalidated: by
+        the transaction that ran add_vocabulary*, or when another connection has
+        committed to the database file since the last lookup.
+        """
+        async with self._vocab_cache_lock:
+            # PRAGMA data_version on the writer only changes when a different
+            # connection commits (our own writes are tracked by transaction()), so
+            # it picks up a load_vocabulary.py run while the server is up.
+            # Any external commit invalidates, whichever table it touched.
+            cursor = await self._connection.execute("PRAGMA data_version")
+            data_version = (await cursor.fetchone())[0]
+            if data_version != self._vocab_data_version:
+                self._vocab_data_version = data_version
+                self._invalidate_vocab_cache()
+            
+            if self._vocab_cache is not None:
+                return self._vocab_cache
+            
+            generation = self._vocab_generation
+            async with self.reader() as conn:
+                cursor = await conn.execute(
+                    """
+                    SELECT id, chinese, pinyin, english, hsk_level, word_type, example_sentence
+                    FROM vocabulary
+                    ORDER BY hsk_level, id
+                    """
+                )
+                rows = await cursor.fetchall()
+            
+            vocab_cache: Dict[int, List[aiosqlite.Row]] = {}
+            for row in rows:
+                vocab_cache.setdefault(row['hsk_level'], []).append(row)
+            
+            # A transaction that committed while the query ran may have added words
+            # this snapshot predates: serve it to this caller but don't keep it
+            if generation == self._vocab_generation:
+                self._vocab_cache = vocab_cache
+            
+            return vocab_cache
     
     async def update_progress(
         self,
@@ -217,73 +593,53 @@ class MandarinDatabase:
         - Incorrect answers decrease mastery level
         - Next review time is calculated based on mastery level
         
+        Review timestamps come from SQLite's clock (UTC) in the same format
+        as utc_timestamp(), which the review queries compare against.
+        
         Args:
             vocabulary_id: vocab item ID
             correct: Whether the user answered correctly
         """
-        # First, check if progress entry exists
-        cursor = await self._connection.execute(
-            "SELECT * FROM user_progress WHERE vocabulary_id = ?",
-            (vocabulary_id,)
-        )
-        existing = await cursor.fetchone()
-        
-        now = datetime.now().isoformat()
-        
-        if existing:
-            # Update existing progress
-            mastery_change = 1 if correct else -1
-            new_mastery = max(0, min(5, existing[2] + mastery_change))  # existing[2] is mastery_level
-            
-            # Calculate next review time based on mastery (simple spaced repetition)
-            # Days until next review: 1, 3, 7, 14, 30, 60
-            days_map = {0: 1, 1: 3, 2: 7, 3: 14, 4: 30, 5: 60}
-            
+        # Single UPSERT: a new word starts at mastery 0/1, an existing word moves
+        # one level up or down (clamped to 0-5). Column references in the UPDATE
+        # see the existing row, so no prior SELECT is needed.
+        async with self.transaction():
             await self._connection.execute(
-                """
-                UPDATE user_progress 
-                SET mastery_level = ?,
-                    times_seen = times_seen + 1,
-                    times_correct = times_correct + ?,
-                    times_incorrect = times_incorrect + ?,
-                    last_reviewed = ?,
-                    next_review = datetime(?, '+' || ? || ' days'),
-                    updated_at = ?
-                WHERE vocabulary_id = ?
-                """,
-                (
-                    new_mastery,
-                    1 if correct else 0,
-                    0 if correct else 1,
-                    now,
-                    now,
-                    days_map[new_mastery],
-                    now,
-                    vocabulary_id
-                )
-            )
-        else:
-            # Create new progress entry
-            initial_mastery = 1 if correct else 0
-            
-            await self._connection.execute(
-                """
-                INSERT INTO user_progress 
-                (vocabulary_id, mastery_level, times_seen, times_correct, times_incorrect, 
-                 last_reviewed, next_review)
-                VALUES (?, ?, 1, ?, ?, ?, datetime(?, '+1 day'))
-                """,
-                (
-                    vocabulary_id,
-                    initial_mastery,
-                    1 if correct else 0,
-                    0 if correct else 1,
-                    now,
-                    now
-                )
+                _UPSERT_PROGRESS_SQL,
+                self._progress_params(vocabulary_id, correct)
             )
+    
+    async def record_quiz_answers(
+        self,
+        answers: List[Tuple[int, bool]]
+    ) -> None:
+        """
+        Update progress for several vocab items in one transaction.
         
-        await self._connection.commit()
+        Applies the same spaced repetition rules as update_progress, but
+        commits once for the whole batch (e.g. all answers in a quiz).
+        
+        Args:
+            answers: List of (vocabulary_id, correct) tuples
+        """
+        async with self.transaction():
+            await self._connection.executemany(
+                _UPSERT_PROGRESS_SQL,
+                [self._progress_params(vocab_id, correct) for vocab_id, correct in answers]
+            )
+    
+    @staticmethod
+    def _progress_params(vocabulary_id: int, correct: bool) -> Tuple[int, ...]:
+        """Build the bound parameters for the progress UPSERT."""
+        mastery_change = 1 if correct else -1
+        return (
+            vocabulary_id,
+            1 if correct else 0,
+            1 if correct else 0,
+            0 if correct else 1,
+            mastery_change,
+            mastery_change
+        )
     
     async def get_progress_stats(self) -> Dict[str, Any]:
         """
@@ -292,41 +648,37 @@ class MandarinDatabase:
         Returns:
             Dictionary with statistics including:
             - total_words_studied: Number of unique words seen
-            - mastery_breakdown: Count of words at each mastery level
+            - mastery_breakdown: Tuple of word counts indexed by mastery level (0-5)
             - total_reviews: Total number of review sessions
             - accuracy: Overall accuracy percentage
         """
-        # Total words studied
-        cursor = await self._connection.execute(
-            "SELECT COUNT(*) FROM user_progress WHERE times_seen > 0"
-        )
-        total_studied = (await cursor.fetchone())[0]
-        
-        # Mastery breakdown
-        cursor = await self._connection.execute(
-            """
-            SELECT mastery_level, COUNT(*) 
-            FROM user_progress 
-            GROUP BY mastery_level
-            ORDER BY mastery_level
-            """
-        )
-        mastery_breakdown = {row[0]: row[1] for row in await cursor.fetchall()}
-        
-        # Total reviews and accuracy
-        cursor = await self._connection.execute(
-            """
-            SELECT 
-                SUM(times_seen) as total_reviews,
-                SUM(times_correct) as total_correct,
-                SUM(times_incorrect) as total_incorrect
-            FROM user_progress
-            """
-        )
-        row = await cursor.fetchone()
-        total_reviews = row[0] or 0
-        total_correct = row[1] or 0
-        total_incorrect = row[2] or 0
+        # Everything comes from one scan of user_progress using conditional aggregation
+        async with self.reader() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT 
+                    SUM(CASE WHEN times_seen > 0 THEN 1 ELSE 0 END) as total_studied,
+                    SUM(times_seen) as total_reviews,
+                    SUM(times_correct) as total_correct,
+                    SUM(times_incorrect) as total_incorrect,
+                    SUM(CASE WHEN mastery_level = 0 THEN 1 ELSE 0 END) as mastery_0,
+                    SUM(CASE WHEN mastery_level = 1 THEN 1 ELSE 0 END) as mastery_1,
+                    SUM(CASE WHEN mastery_level = 2 THEN 1 ELSE 0 END) as mastery_2,
+                    SUM(CASE WHEN mastery_level = 3 THEN 1 ELSE 0 END) as mastery_3,
+                    SUM(CASE WHEN mastery_level = 4 THEN 1 ELSE 0 END) as mastery_4,
+                    SUM(CASE WHEN mastery_level = 5 THEN 1 ELSE 0 END) as mastery_5
+                FROM user_progress
+                """
+            )
+            row = await cursor.fetchone()
+        
+        total_studied = row[0] or 0
+        total_reviews = row[1] or 0
+        total_correct = row[2] or 0
+        total_incorrect = row[3] or 0
+        
+        # Dense per-level counts, indexed by mastery level 0-5
+        mastery_breakdown = tuple(count or 0 for count in row[4:10])
         
         accuracy = (total_correct / total_reviews * 100) if total_reviews > 0 else 0
         
@@ -362,40 +714,42 @@ class MandarinDatabase:
         """
         score_percentage = (correct_answers / total_questions * 100) if total_questions > 0 else 0
         
-        cursor = await self._connection.execute(
-            """
-            INSERT INTO quiz_results 
-            (quiz_type, hsk_level, total_questions, correct_answers, score_percentage, duration_seconds)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (quiz_type, hsk_level, total_questions, correct_answers, score_percentage, duration_seconds)
-        )
-        await self._connection.commit()
+        async with self.transaction():
+            cursor = await self._connection.execute(
+                """
+                INSERT INTO quiz_results 
+                (quiz_type, hsk_level, total_questions, correct_answers, score_percentage, duration_seconds)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (quiz_type, hsk_level, total_questions, correct_answers, score_percentage, duration_seconds)
+            )
         return cursor.lastrowid
     
-    async def get_quiz_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+    async def get_quiz_history(self, limit: int = 10) -> List[aiosqlite.Row]:
         """
         Get recent quiz results.
         
+        Rows are returned as-is rather than copied into dicts; they support
+        row['column'] access, which is all the history display needs.
+        
         Args:
             limit: Maximum number of results to return
         
         Returns:
-            List of quiz result dictionaries, ordered by most recent first
-        """
-        cursor = await self._connection.execute(
-            """
-            SELECT id, quiz_type, hsk_level, total_questions, correct_answers, 
-                   score_percentage, duration_seconds, created_at
-            FROM quiz_results 
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (limit,)
-        )
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+            List of quiz result rows, ordered by most recent first
+        """
+        async with self.reader() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT id, quiz_type, hsk_level, total_questions, correct_answers, 
+                       score_percentage, duration_seconds, created_at
+                FROM quiz_results 
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                (limit,)
+            )
+            return await cursor.fetchall()
     
     async def get_words_for_review(self, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -407,20 +761,10 @@ class MandarinDatabase:
         Returns:
             List of vocab items with progress information
         """
-        cursor = await self._connection.execute(
-            """
-            SELECT v.*, up.mastery_level, up.times_seen, up.last_reviewed
-            FROM vocabulary v
-            INNER JOIN user_progress up ON v.id = up.vocabulary_id
-            WHERE up.next_review <= datetime('now')
-            ORDER BY up.next_review ASC
-            LIMIT ?
-            """,
-            (limit,)
-        )
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        async with self.reader() as conn:
+            cursor = await conn.execute(_WORDS_FOR_REVIEW_SQL, (utc_timestamp(), limit))
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
     
     async def clear_all_progress(self) -> None:
         """
@@ -428,7 +772,7 @@ class MandarinDatabase:
         
         Warning: Deletes all progress tracking but keeps vocab intact.
         """
-        await self._connection.execute("DELETE FROM user_progress")
-        await self._connection.execute("DELETE FROM quiz_results")
-        await self._connection.execute("DELETE FROM learning_sessions")
-        await self._connection.commit()
\ No newline at end of file
+        async with self.transaction():
+            await self._connection.execute("DELETE FROM user_progress")
+            await self._connection.execute("DELETE FROM quiz_results")
+            await self._connection.execute("DELETE FROM learning_sessions")
\ No newline at end of file
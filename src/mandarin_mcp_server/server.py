@@ -10,8 +10,8 @@ This module implements the main MCP server that exposes tools for:
 
 import asyncio
 import logging
-from typing import Any, Optional
-from pathlib import Path
+from itertools import islice
+from typing import Any
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -21,10 +21,276 @@ from .database import MandarinDatabase
 from .vocabulary import VocabularyManager
 from .testing import QuizManager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Most formatted get_vocabulary_by_level responses kept per server
+_LEVEL_TEXT_CACHE_SIZE = 64
+
+# Tool definitions are static, so they are built once at import rather than
+# on every list_tools request
+_TOOL_DEFINITIONS: tuple[Tool, ...] = (
+    Tool(
+        name="get_progress_stats",
+        description=(
+            "Get the user's overall learning progress statistics including "
+            "total words studied, accuracy, and mastery breakdown across HSK levels."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="learn_vocabulary",
+        description=(
+            "Present new vocabulary words for the user to learn. "
+            "Specify an HSK level (1-6) and number of words to learn. "
+            "Returns vocabulary with Chinese characters, pinyin, and English translations."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "hsk_level": {
+                    "type": "integer",
+                    "description": "HSK level to learn from (1-6)",
+                    "minimum": 1,
+                    "maximum": 6
+                },
+                "count": {
+                    "type": "integer",
+                    "description": "Number of words to learn",
+                    "minimum": 1,
+                    "maximum": 20,
+                    "default": 5
+                }
+            },
+            "required": ["hsk_level"]
+        }
+    ),
+    Tool(
+        name="get_vocabulary_by_level",
+        description=(
+            "Retrieve vocabulary for a specific HSK level. "
+            "Useful for reviewing what words are available at each level."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "hsk_level": {
+                    "type": "integer",
+                    "description": "HSK level (1-6)",
+                    "minimum": 1,
+                    "maximum": 6
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of words to return",
+                    "minimum": 1,
+                    "maximum": 100,
+                    "default": 10
+                }
+            },
+            "required": ["hsk_level"]
+        }
+    ),
+    Tool(
+        name="search_vocabulary",
+        description=(
+            "Search for vocabulary by Chinese characters, pinyin, or English meaning. "
+            "Can optionally filter by HSK level."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "search_term": {
+                    "type": "string",
+                    "description": "Search query (Chinese, pinyin, or English)"
+                },
+                "hsk_level": {
+                    "type": "integer",
+                    "description": "Optional HSK level filter (1-6)",
+                    "minimum": 1,
+                    "maximum": 6
+                }
+            },
+            "required": ["search_term"]
+        }
+    ),
+    Tool(
+        name="get_vocabulary_statistics",
+        description=(
+            "Get detailed statistics about vocabulary in the database, "
+            "including total counts, HSK distribution, and learning progress."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    Tool(
+        name="take_quiz",
+        description=(
+            "Generate and take a quiz to test vocabulary knowledge. "
+            "Specify HSK level and number of questions. The quiz will test "
+            "Chinese-to-English translation."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "hsk_level": {
+                    "type": "integer",
+                    "description": "HSK level to quiz on (1-6)",
+                    "minimum": 1,
+                    "maximum": 6
+                },
+                "num_questions": {
+                    "type": "integer",
+                    "description": "Number of quiz questions",
+                    "minimum": 1,
+                    "maximum": 20,
+                    "default": 5
+                }
+            },
+            "required": ["hsk_level"]
+        }
+    ),
+    Tool(
+        name="submit_quiz_answers",
+        description=(
+            "Submit answers to a quiz and get results. "
+            "Provide the quiz ID and a list of answers."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "quiz_id": {
+                    "type": "string",
+                    "description": "ID of the quiz being answered"
+                },
+                "answers": {
+                    "type": "array",
+                    "description": "List of user's answers",
+                    "items": {
+                        "type": "string"
+                    }
+                }
+            },
+            "required": ["quiz_id", "answers"]
+        }
+    ),
+    Tool(
+        name="get_quiz_history",
+        description=(
+            "Get the history of past quiz attempts with scores and dates."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results to return",
+                    "minimum": 1,
+                    "maximum": 50,
+                    "default": 10
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="export_to_anki",
+        description=(
+            "Export learned vocabulary to a CSV file suitable for importing into Anki. "
+            "Can filter by HSK level or export all learned vocabulary."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "hsk_level": {
+                    "type": "integer",
+                    "description": "HSK level to export (optional, exports all if not specified)",
+                    "minimum": 1,
+                    "maximum": 6
+                },
+                "filename": {
+                    "type": "string",
+                    "description": "Output filename for the CSV",
+                    "default": "mandarin_vocabulary.csv"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="clear_progress",
+        description=(
+            "Clear all learning progress and start fresh. "
+            "WARNING: This deletes all progress tracking data but keeps vocabulary intact."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "confirm": {
+                    "type": "boolean",
+                    "description": "Must be true to confirm deletion"
+                }
+            },
+            "required": ["confirm"]
+        }
+    ),
+)
+
+# Header of the get_progress_stats response, filled from the stats dict
+_PROGRESS_TEMPLATE = """📊 **Learning Progress Statistics**
+
+📚 **Words Studied:** {total_words_studied}
+📝 **Total Reviews:** {total_reviews}
+✅ **Accuracy:** {accuracy}%
+✓ **Correct Answers:** {total_correct}
+✗ **Incorrect Answers:** {total_incorrect}
+
+🎯 **Mastery Breakdown:**
+"""
+
+# Indexed by mastery level, which the database clamps to 0-5
+_MASTERY_LABELS = ("New/Struggling", "Learning", "Familiar", "Comfortable", "Good", "Mastered")
+
+# Quiz history emoji indexed by score decile: <50 📚, <70 📝, <90 ✅, else 🌟
+_SCORE_EMOJI = ("📚", "📚", "📚", "📚", "📚", "📝", "📝", "✅", "✅", "🌟", "🌟")
+
+_HSK_LEVELS = (1, 2, 3, 4, 5, 6)
+
+# Distribution bars by length, one block per ten words up to 50
+_BAR_CACHE = tuple("█" * i for i in range(51))
+
+# Fixed response fragments shared by the handlers
+_HDR_QUIZ_HISTORY = "📜 **Quiz History** (last {n} quizzes)\n\n"
+_TIP_LEARN = "\n\n💡 **Tip:** Practice these words and then take a quiz to test your knowledge!"
+_TIP_QUIZ_SUBMIT = "\n\n📝 **To submit:** Use the `submit_quiz_answers` tool with this quiz ID and your answers as a list."
+_TIP_QUIZ_NOTE = "\n\n💡 **Note:** All questions include pinyin to help with pronunciation."
+
+# Fixed responses are built once; each call still gets its own list.
+# Per-call responses in the handlers use TextContent.model_construct, skipping
+# pydantic validation of fields the server always sets itself
+_RESP_NO_QUIZ_HISTORY = TextContent(
+    type="text",
+    text="No quiz history found. Take a quiz to get started!"
+)
+_RESP_EXPORT_STUB = TextContent(
+    type="text",
+    text="Anki export functionality will be implemented in the next stage."
+)
+_RESP_CLEAR_CANCELLED = TextContent(
+    type="text",
+    text="⚠️  Progress clearing cancelled. Set 'confirm' to true to proceed."
+)
+_RESP_CLEAR_OK = TextContent(
+    type="text",
+    text="✅ All learning progress has been cleared. Vocabulary remains intact. You can start fresh!"
+)
+
 
 class MandarinMCPServer:
     """
@@ -43,6 +309,26 @@ class MandarinMCPServer:
         self.db = MandarinDatabase(db_path)
         self.vocab_manager = VocabularyManager(self.db)
         self.quiz_manager = QuizManager(self.db, self.vocab_manager)
+        
+        # Formatted get_vocabulary_by_level text keyed by (hsk_level, limit);
+        # only valid while db.vocab_generation equals _level_text_generation
+        self._level_text_cache: dict[tuple[int, int], str] = {}
+        self._level_text_generation = -1
+        
+        # Tool name -> handler, so call_tool is a single dict lookup
+        self._dispatch = {
+            "get_progress_stats": self._handle_get_progress_stats,
+            "learn_vocabulary": self._handle_learn_vocabulary,
+            "get_vocabulary_by_level": self._handle_get_vocabulary_by_level,
+            "search_vocabulary": self._handle_search_vocabulary,
+            "get_vocabulary_statistics": self._handle_get_vocabulary_statistics,
+            "take_quiz": self._handle_take_quiz,
+            "submit_quiz_answers": self._handle_submit_quiz_answers,
+            "get_quiz_history": self._handle_get_quiz_history,
+            "export_to_anki": self._handle_export_to_anki,
+            "clear_progress": self._handle_clear_progress,
+        }
+        
         self._setup_handlers()
     
     def _setup_handlers(self) -> None:
@@ -56,219 +342,7 @@ class MandarinMCPServer:
             Returns:
                 List of tool definitions that Claude can call
             """
-            return [
-                Tool(
-                    name="get_progress_stats",
-                    description=(
-                        "Get the user's overall learning progress statistics including "
-                        "total words studied, accuracy, and mastery breakdown across HSK levels."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="learn_vocabulary",
-                    description=(
-                        "Present new vocabulary words for the user to learn. "
-                        "Specify an HSK level (1-6) and number of words to learn. "
-                        "Returns vocabulary with Chinese characters, pinyin, and English translations."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "hsk_level": {
-                                "type": "integer",
-                                "description": "HSK level to learn from (1-6)",
-                                "minimum": 1,
-                                "maximum": 6
-                            },
-                            "count": {
-                                "type": "integer",
-                                "description": "Number of words to learn",
-                                "minimum": 1,
-                                "maximum": 20,
-                                "default": 5
-                            }
-                        },
-                        "required": ["hsk_level"]
-                    }
-                ),
-                Tool(
-                    name="get_vocabulary_by_level",
-                    description=(
-                        "Retrieve vocabulary for a specific HSK level. "
-                        "Useful for reviewing what words are available at each level."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "hsk_level": {
-                                "type": "integer",
-                                "description": "HSK level (1-6)",
-                                "minimum": 1,
-                                "maximum": 6
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of words to return",
-                                "minimum": 1,
-                                "maximum": 100,
-                                "default": 10
-                            }
-                        },
-                        "required": ["hsk_level"]
-                    }
-                ),
-                Tool(
-                    name="search_vocabulary",
-                    description=(
-                        "Search for vocabulary by Chinese characters, pinyin, or English meaning. "
-                        "Can optionally filter by HSK level."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "search_term": {
-                                "type": "string",
-                                "description": "Search query (Chinese, pinyin, or English)"
-                            },
-                            "hsk_level": {
-                                "type": "integer",
-                                "description": "Optional HSK level filter (1-6)",
-                                "minimum": 1,
-                                "maximum": 6
-                            }
-                        },
-                        "required": ["search_term"]
-                    }
-                ),
-                Tool(
-                    name="get_vocabulary_statistics",
-                    description=(
-                        "Get detailed statistics about vocabulary in the database, "
-                        "including total counts, HSK distribution, and learning progress."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="take_quiz",
-                    description=(
-                        "Generate and take a quiz to test vocabulary knowledge. "
-                        "Specify HSK level and number of questions. The quiz will test "
-                        "Chinese-to-English translation."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "hsk_level": {
-                                "type": "integer",
-                                "description": "HSK level to quiz on (1-6)",
-                                "minimum": 1,
-                                "maximum": 6
-                            },
-                            "num_questions": {
-                                "type": "integer",
-                                "description": "Number of quiz questions",
-                                "minimum": 1,
-                                "maximum": 20,
-                                "default": 5
-                            }
-                        },
-                        "required": ["hsk_level"]
-                    }
-                ),
-                Tool(
-                    name="submit_quiz_answers",
-                    description=(
-                        "Submit answers to a quiz and get results. "
-                        "Provide the quiz ID and a list of answers."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "quiz_id": {
-                                "type": "string",
-                                "description": "ID of the quiz being answered"
-                            },
-                            "answers": {
-                                "type": "array",
-                                "description": "List of user's answers",
-                                "items": {
-                                    "type": "string"
-                                }
-                            }
-                        },
-                        "required": ["quiz_id", "answers"]
-                    }
-                ),
-                Tool(
-                    name="get_quiz_history",
-                    description=(
-                        "Get the history of past quiz attempts with scores and dates."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of results to return",
-                                "minimum": 1,
-                                "maximum": 50,
-                                "default": 10
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="export_to_anki",
-                    description=(
-                        "Export learned vocabulary to a CSV file suitable for importing into Anki. "
-                        "Can filter by HSK level or export all learned vocabulary."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "hsk_level": {
-                                "type": "integer",
-                                "description": "HSK level to export (optional, exports all if not specified)",
-                                "minimum": 1,
-                                "maximum": 6
-                            },
-                            "filename": {
-                                "type": "string",
-                                "description": "Output filename for the CSV",
-                                "default": "mandarin_vocabulary.csv"
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="clear_progress",
-                    description=(
-                        "Clear all learning progress and start fresh. "
-                        "WARNING: This deletes all progress tracking data but keeps vocabulary intact."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "confirm": {
-                                "type": "boolean",
-                                "description": "Must be true to confirm deletion"
-                            }
-                        },
-                        "required": ["confirm"]
-                    }
-                )
-            ]
+            return list(_TOOL_DEFINITIONS)
         
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Any) -> list[TextContent]:
@@ -283,78 +357,35 @@ class MandarinMCPServer:
                 List of text content responses
             """
             try:
-                if name == "get_progress_stats":
-                    return await self._handle_get_progress_stats()
-                
-                elif name == "learn_vocabulary":
-                    return await self._handle_learn_vocabulary(arguments)
-                
-                elif name == "get_vocabulary_by_level":
-                    return await self._handle_get_vocabulary_by_level(arguments)
-                
-                elif name == "search_vocabulary":
-                    return await self._handle_search_vocabulary(arguments)
-                
-                elif name == "get_vocabulary_statistics":
-                    return await self._handle_get_vocabulary_statistics()
-                
-                elif name == "take_quiz":
-                    return await self._handle_take_quiz(arguments)
-                
-                elif name == "submit_quiz_answers":
-                    return await self._handle_submit_quiz_answers(arguments)
-                
-                elif name == "get_quiz_history":
-                    return await self._handle_get_quiz_history(arguments)
-                
-                elif name == "export_to_anki":
-                    return await self._handle_export_to_anki(arguments)
-                
-                elif name == "clear_progress":
-                    return await self._handle_clear_progress(arguments)
-                
-                else:
-                    return [TextContent(
+                handler = self._dispatch.get(name)
+                if handler is None:
+                    return [TextContent.model_construct(
                         type="text",
                         text=f"Unknown tool: {name}"
                     )]
+                
+                # No-argument tools may arrive with arguments=None
+                args = arguments if isinstance(arguments, dict) else {}
+                return await handler(args)
             
             except Exception as e:
-                logger.error(f"Error handling tool {name}: {e}", exc_info=True)
-                return [TextContent(
+                logger.error("Error handling tool %s: %s", name, e, exc_info=True)
+                return [TextContent.model_construct(
                     type="text",
                     text=f"Error: {str(e)}"
                 )]
     
-    async def _handle_get_progress_stats(self) -> list[TextContent]:
+    async def _handle_get_progress_stats(self, arguments: dict) -> list[TextContent]:
         """Handle get_progress_stats tool call."""
         stats = await self.db.get_progress_stats()
         
-        response = f"""📊 **Learning Progress Statistics**
-
-📚 **Words Studied:** {stats['total_words_studied']}
-📝 **Total Reviews:** {stats['total_reviews']}
-✅ **Accuracy:** {stats['accuracy']}%
-✓ **Correct Answers:** {stats['total_correct']}
-✗ **Incorrect Answers:** {stats['total_incorrect']}
-
-🎯 **Mastery Breakdown:**
-"""
-        
-        mastery_labels = {
-            0: "New/Struggling",
-            1: "Learning", 
-            2: "Familiar",
-            3: "Comfortable",
-            4: "Good",
-            5: "Mastered"
-        }
+        parts = [_PROGRESS_TEMPLATE.format_map(stats)]
         
-        for level, count in sorted(stats['mastery_breakdown'].items()):
-            label = mastery_labels.get(level, f"Level {level}")
-            response += f"  {label}: {count} words\n"
+        for label, count in zip(_MASTERY_LABELS, stats['mastery_breakdown']):
+            if count:
+                parts.append(f"  {label}: {count} words\n")
         
-        return [TextContent(type="text", text=response)]
+        return [TextContent.model_construct(type="text", text="".join(parts))]
     
     async def _handle_learn_vocabulary(self, arguments: dict) -> list[TextContent]:
         """Handle learn_vocabulary tool call."""
@@ -369,16 +400,23 @@ class MandarinMCPServer:
         )
         
         if not vocab_list:
-            return [TextContent(
+            return [TextContent.model_construct(
                 type="text",
                 text=f"Great! You've already seen all HSK {hsk_level} vocabulary. Try a higher level or review existing words."
             )]
         
-        response = f"📖 **Learning New HSK {hsk_level} Vocabulary** ({len(vocab_list)} words)\n\n"
-        response += self.vocab_manager.format_vocabulary_for_display(vocab_list, include_progress=False)
-        response += "\n\n💡 **Tip:** Practice these words and then take a quiz to test your knowledge!"
+        # Formatting is CPU-only, so it runs off the event loop
+        formatted = await asyncio.to_thread(
+            self.vocab_manager.format_vocabulary_for_display, vocab_list, False
+        )
         
-        return [TextContent(type="text", text=response)]
+        parts = [
+            f"📖 **Learning New HSK {hsk_level} Vocabulary** ({len(vocab_list)} words)\n\n",
+            formatted,
+            _TIP_LEARN
+        ]
+        
+        return [TextContent.model_construct(type="text", text="".join(parts))]
     
     async def _handle_get_vocabulary_by_level(self, arguments: dict) -> list[TextContent]:
         """Handle get_vocabulary_by_level tool call."""
@@ -386,17 +424,38 @@ class MandarinMCPServer:
         limit = arguments.get("limit", 10)
         
         vocab_list = await self.db.get_vocabulary_by_hsk_level(hsk_level, limit=limit)
+        # Read straight after the fetch, which may itself refresh the cache
+        generation = self.db.vocab_generation
         
         if not vocab_list:
-            return [TextContent(
+            return [TextContent.model_construct(
                 type="text",
                 text=f"No vocabulary found for HSK {hsk_level}."
             )]
         
-        response = f"📚 **HSK {hsk_level} Vocabulary** (showing {len(vocab_list)} words)\n\n"
-        response += self.vocab_manager.format_vocabulary_for_display(vocab_list, include_progress=False)
+        # Formatted text is reused until the database drops its vocabulary cache
+        if self._level_text_generation != generation:
+            self._level_text_cache.clear()
+            self._level_text_generation = generation
+        
+        key = (hsk_level, limit)
+        text = self._level_text_cache.get(key)
+        if text is None:
+            # Formatting is CPU-only, so it runs off the event loop
+            formatted = await asyncio.to_thread(
+                self.vocab_manager.format_vocabulary_for_display, vocab_list, False
+            )
+            text = "".join([
+                f"📚 **HSK {hsk_level} Vocabulary** (showing {len(vocab_list)} words)\n\n",
+                formatted
+            ])
+            
+            # Not kept if the vocabulary changed while formatting
+            if (generation == self.db.vocab_generation == self._level_text_generation
+                    and len(self._level_text_cache) < _LEVEL_TEXT_CACHE_SIZE):
+                self._level_text_cache[key] = text
         
-        return [TextContent(type="text", text=response)]
+        return [TextContent.model_construct(type="text", text=text)]
     
     async def _handle_search_vocabulary(self, arguments: dict) -> list[TextContent]:
         """Handle search_vocabulary tool call."""
@@ -406,41 +465,49 @@ class MandarinMCPServer:
         results = await self.vocab_manager.search_vocabulary(search_term, hsk_level)
         
         if not results:
-            return [TextContent(
+            return [TextContent.model_construct(
                 type="text",
                 text=f"No vocabulary found matching '{search_term}'."
             )]
         
         hsk_filter = f" (HSK {hsk_level})" if hsk_level else ""
-        response = f"🔍 **Search Results for '{search_term}'{hsk_filter}** ({len(results)} words)\n\n"
-        response += self.vocab_manager.format_vocabulary_for_display(results, include_progress=False)
+        formatted = await asyncio.to_thread(
+            self.vocab_manager.format_vocabulary_for_display, results, False
+        )
+        
+        parts = [
+            f"🔍 **Search Results for '{search_term}'{hsk_filter}** ({len(results)} words)\n\n",
+            formatted
+        ]
         
-        return [TextContent(type="text", text=response)]
+        return [TextContent.model_construct(type="text", text="".join(parts))]
     
-    async def _handle_get_vocabulary_statistics(self) -> list[TextContent]:
+    async def _handle_get_vocabulary_statistics(self, arguments: dict) -> list[TextContent]:
         """Handle get_vocabulary_statistics tool call."""
         stats = await self.vocab_manager.get_vocabulary_statistics()
         
-        response = f"""📊 **Vocabulary Database Statistics**
+        parts = [f"""📊 **Vocabulary Database Statistics**
 
 📚 **Total Vocabulary:** {stats['total_vocabulary']} words
 ✅ **Learned:** {stats['learned_vocabulary']} words
 🆕 **New/Unseen:** {stats['new_vocabulary']} words
 
 **HSK Level Distribution:**
-"""
+"""]
         
-        for level in range(1, 7):
-            count = stats['hsk_level_counts'].get(level, 0)
+        counts = stats['hsk_level_counts']
+        for level in _HSK_LEVELS:
+            count = counts.get(level, 0)
             if count > 0:
-                bar = "█" * min(count // 10, 50)  # Visual bar
-                response += f"  HSK {level}: {count} words {bar}\n"
+                bar = _BAR_CACHE[min(count // 10, 50)]  # Visual bar
+                parts.append(f"  HSK {level}: {count} words {bar}\n")
         
-        response += "\n**Word Types:**\n"
-        for word_type, count in sorted(stats['word_type_counts'].items(), key=lambda x: x[1], reverse=True)[:10]:
-            response += f"  {word_type.capitalize()}: {count}\n"
+        parts.append("\n**Word Types:**\n")
+        # word_type_counts arrives ordered by count, most common first
+        for word_type, count in islice(stats['word_type_counts'].items(), 10):
+            parts.append(f"  {word_type.capitalize()}: {count}\n")
         
-        return [TextContent(type="text", text=response)]
+        return [TextContent.model_construct(type="text", text="".join(parts))]
     
     async def _handle_take_quiz(self, arguments: dict) -> list[TextContent]:
         """Handle take_quiz tool call."""
@@ -455,16 +522,20 @@ class MandarinMCPServer:
                 direction="chinese_to_english"
             )
             
-            response = self.quiz_manager.format_quiz_for_display(quiz)
-            response += f"\n\n**Quiz ID:** `{quiz.quiz_id}`"
-            response += "\n\n📝 **To submit:** Use the `submit_quiz_answers` tool with this quiz ID and your answers as a list."
-            response += f"\n\n💡 **Note:** All questions include pinyin to help with pronunciation."
+            formatted = await asyncio.to_thread(self.quiz_manager.format_quiz_for_display, quiz)
+            
+            parts = [
+                formatted,
+                f"\n\n**Quiz ID:** `{quiz.quiz_id}`",
+                _TIP_QUIZ_SUBMIT,
+                _TIP_QUIZ_NOTE
+            ]
             
-            return [TextContent(type="text", text=response)]
+            return [TextContent.model_construct(type="text", text="".join(parts))]
         
         except Exception as e:
-            logger.error(f"Error generating quiz: {e}", exc_info=True)
-            return [TextContent(
+            logger.error("Error generating quiz: %s", e, exc_info=True)
+            return [TextContent.model_construct(
                 type="text",
                 text=f"Error generating quiz: {str(e)}"
             )]
@@ -476,17 +547,17 @@ class MandarinMCPServer:
         
         try:
             results = await self.quiz_manager.submit_quiz(quiz_id, answers)
-            response = self.quiz_manager.format_results_for_display(results)
+            response = await asyncio.to_thread(self.quiz_manager.format_results_for_display, results)
             
-            return [TextContent(type="text", text=response)]
+            return [TextContent.model_construct(type="text", text=response)]
         
         except ValueError as e:
-            return [TextContent(
+            return [TextContent.model_construct(
                 type="text",
                 text=f"Error: {str(e)}"
             )]
         except Exception as e:
-            return [TextContent(
+            return [TextContent.model_construct(
                 type="text",
                 text=f"Unexpected error: {str(e)}"
             )]
@@ -497,80 +568,77 @@ class MandarinMCPServer:
         history = await self.db.get_quiz_history(limit=limit)
         
         if not history:
-            return [TextContent(
-                type="text",
-                text="No quiz history found. Take a quiz to get started!"
-            )]
+            return [_RESP_NO_QUIZ_HISTORY]
         
-        response = f"📜 **Quiz History** (last {len(history)} quizzes)\n\n"
+        parts = [_HDR_QUIZ_HISTORY.format(n=len(history))]
         
         for quiz in history:
             hsk_info = f"HSK {quiz['hsk_level']}" if quiz['hsk_level'] else "Mixed"
             score = quiz['score_percentage']
+            emoji = _SCORE_EMOJI[min(int(score) // 10, 10)]
             
-            # Add emoji based on score
-            if score >= 90:
-                emoji = "🌟"
-            elif score >= 70:
-                emoji = "✅"
-            elif score >= 50:
-                emoji = "📝"
-            else:
-                emoji = "📚"
-            
-            response += f"{emoji} **{hsk_info}** - {quiz['correct_answers']}/{quiz['total_questions']} ({score}%)\n"
-            response += f"   Type: {quiz['quiz_type']} | Date: {quiz['created_at']}\n\n"
+            parts.append(f"{emoji} **{hsk_info}** - {quiz['correct_answers']}/{quiz['total_questions']} ({score}%)\n")
+            parts.append(f"   Type: {quiz['quiz_type']} | Date: {quiz['created_at']}\n\n")
         
-        return [TextContent(type="text", text=response)]
+        return [TextContent.model_construct(type="text", text="".join(parts))]
     
     async def _handle_export_to_anki(self, arguments: dict) -> list[TextContent]:
         """Handle export_to_anki tool call."""
         # This will be implemented in Stage 6 with the anki_export module
-        return [TextContent(
-            type="text",
-            text="Anki export functionality will be implemented in the next stage."
-        )]
+        return [_RESP_EXPORT_STUB]
     
     async def _handle_clear_progress(self, arguments: dict) -> list[TextContent]:
         """Handle clear_progress tool call."""
         confirm = arguments.get("confirm", False)
         
         if not confirm:
-            return [TextContent(
-                type="text",
-                text="⚠️  Progress clearing cancelled. Set 'confirm' to true to proceed."
-            )]
+            return [_RESP_CLEAR_CANCELLED]
         
         await self.db.clear_all_progress()
         
-        return [TextContent(
-            type="text",
-            text="✅ All learning progress has been cleared. Vocabulary remains intact. You can start fresh!"
-        )]
+        return [_RESP_CLEAR_OK]
     
-    async def run(self) -> None:
-        """Run server."""
-        # Connect to database
+    async def _init_db(self) -> None:
+        """Connect to the database and make sure the schema exists."""
         await self.db.connect()
         await self.db.initialise_schema()
         logger.info("Database connected and initialised")
+    
+    async def run(self) -> None:
+        """Run server."""
+        # Database setup overlaps opening the stdio transport; no request can
+        # be handled before server.run starts, and that waits for the database
+        db_ready = asyncio.create_task(self._init_db())
         
-        # Run server using stdio transport
-        async with stdio_server() as (read_stream, write_stream):
-            logger.info("Server starting...")
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options()
-            )
+        try:
+            # Run server using stdio transport
+            async with stdio_server() as (read_stream, write_stream):
+                await db_ready
+                logger.info("Server starting...")
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options()
+                )
+        finally:
+            db_ready.cancel()
 
 
 async def main():
     """Main entry point for server."""
+    # Configured here rather than at import so embedding the package
+    # doesn't override the host application's logging
+    logging.basicConfig(level=logging.INFO)
     server = MandarinMCPServer()
     await server.run()
 
 
 # Allow running directly with: python -m mandarin_mcp_server.server
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # uvloop is optional; use it for the stdio event loop when it's installed.
+    # uvloop.run only exists from 0.18, so older installs fall back too
+    try:
+        from uvloop import run
+    except ImportError:
+        run = asyncio.run
+    run(main())
\ No newline at end of file
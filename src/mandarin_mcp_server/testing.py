@@ -9,14 +9,35 @@ Handles:
 """
 
 import random
-import uuid
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime
+import secrets
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import datetime, timezone
 
 from .database import MandarinDatabase
 from .vocabulary import VocabularyManager
 
 
+# Abandoned quizzes are never submitted, so active quizzes are capped in
+# number and expire after an hour
+MAX_ACTIVE_QUIZZES = 1024
+QUIZ_TTL_SECONDS = 3600
+
+# Result grade indexed by score decile: <50, <70, <90, then 90 and above
+_GRADES = (
+    ("Keep practicing! 📚",) * 5
+    + ("Not bad! 📝",) * 2
+    + ("Good job! ✅",) * 2
+    + ("Excellent! 🌟",) * 2
+)
+
+
+def _acceptable_answers(correct_answer: str) -> Tuple[str, ...]:
+    """Split a comma-separated answer into its normalised alternatives."""
+    return tuple(ans.strip().lower() for ans in correct_answer.split(','))
+
+
 class Quiz:
     """
     Stores quiz questions, correct answers, tracks user responses.
@@ -42,14 +63,20 @@ class Quiz:
         self.hsk_level = hsk_level
         self.questions = questions
         self.quiz_type = quiz_type
-        self.start_time = datetime.now()
+        # start_time is UTC, matching the database's timestamps, and only used
+        # for display; durations use the monotonic clock
+        self.start_time = datetime.now(timezone.utc)
+        self._start_monotonic = time.monotonic()
         self.user_answers: List[str] = []
         self.is_completed = False
     
+    def is_expired(self) -> bool:
+        """Check whether quiz has been open longer than QUIZ_TTL_SECONDS."""
+        return time.monotonic() - self._start_monotonic > QUIZ_TTL_SECONDS
+    
     def get_duration_seconds(self) -> int:
         """Get duration of quiz in seconds."""
-        end_time = datetime.now()
-        return int((end_time - self.start_time).total_seconds())
+        return int(time.monotonic() - self._start_monotonic)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert quiz to dictionary for serialisation."""
@@ -80,7 +107,8 @@ class QuizManager:
         """
         self.db = db
         self.vocab_manager = vocab_manager
-        self.active_quizzes: Dict[str, Quiz] = {}
+        # Insertion order is creation order, so the oldest quiz is always first
+        self.active_quizzes: OrderedDict[str, Quiz] = OrderedDict()
     
     async def generate_translation_quiz(
         self,
@@ -99,14 +127,8 @@ class QuizManager:
         Returns:
             Quiz object
         """
-        # Get vocab for this level
-        vocab_list = await self.db.get_vocabulary_by_hsk_level(hsk_level, limit=None)
-        
-        if len(vocab_list) < num_questions:
-            num_questions = len(vocab_list)
-        
-        # Randomly select questions
-        selected = random.sample(vocab_list, num_questions)
+        # Randomly select questions; only the sample is materialised, not the level
+        selected = await self.db.get_random_vocabulary_by_hsk_level(hsk_level, num_questions)
         
         questions = []
         for vocab in selected:
@@ -117,6 +139,7 @@ class QuizManager:
                     "chinese": vocab['chinese'],
                     "pinyin": vocab['pinyin'],
                     "correct_answer": vocab['english'].lower().strip(),
+                    "acceptable_answers": _acceptable_answers(vocab['english']),
                     "question_type": "translation"
                 }
             else:  # english_to_chinese
@@ -125,6 +148,7 @@ class QuizManager:
                     "vocab_id": vocab['id'],
                     "english": vocab['english'],
                     "correct_answer": vocab['chinese'],
+                    "acceptable_answers": _acceptable_answers(vocab['chinese']),
                     "pinyin_hint": vocab['pinyin'],
                     "question_type": "translation"
                 }
@@ -132,9 +156,9 @@ class QuizManager:
             questions.append(question)
         
         # Create quiz
-        quiz_id = str(uuid.uuid4())
+        quiz_id = secrets.token_hex(8)
         quiz = Quiz(quiz_id, hsk_level, questions, quiz_type="translation")
-        self.active_quizzes[quiz_id] = quiz
+        self._add_active_quiz(quiz)
         
         return quiz
     
@@ -162,21 +186,26 @@ class QuizManager:
         if len(vocab_list) < 4:
             raise ValueError("Need at least 4 vocabulary items for multiple choice")
         
-        # Randomly select questions
-        selected = random.sample(vocab_list, num_questions)
+        # Randomly select questions by index, so distractors can exclude the answer cheaply
+        n = len(vocab_list)
+        selected = random.sample(range(n), num_questions)
         
         questions = []
-        for vocab in selected:
-            # Generate wrong answers (distractors)
-            other_vocab = [v for v in vocab_list if v['id'] != vocab['id']]
-            distractors = random.sample(other_vocab, min(3, len(other_vocab)))
+        for i in selected:
+            vocab = vocab_list[i]
             
-            # Create choices (correct answer + 3 wrong answers)
-            choices = [vocab['english']] + [d['english'] for d in distractors[:3]]
-            random.shuffle(choices)
+            # Generate wrong answers (distractors) by rejection sampling indices,
+            # rather than copying the level without the current word
+            picked = []
+            while len(picked) < 3:
+                j = random.randrange(n)
+                if j != i and j not in picked:
+                    picked.append(j)
+            choices = [vocab_list[j]['english'] for j in picked]
             
-            # Find index of correct answer (A, B, C, or D)
-            correct_index = choices.index(vocab['english'])
+            # Place the correct answer at a random position (A, B, C, or D)
+            correct_index = random.randrange(4)
+            choices.insert(correct_index, vocab['english'])
             correct_letter = chr(65 + correct_index)  # 65 is ASCII for 'A'
             
             question = {
@@ -188,7 +217,7 @@ class QuizManager:
                     "A": choices[0],
                     "B": choices[1],
                     "C": choices[2],
-                    "D": choices[3] if len(choices) > 3 else choices[0]
+                    "D": choices[3]
                 },
                 "correct_answer": correct_letter,
                 "question_type": "multiple_choice"
@@ -197,9 +226,9 @@ class QuizManager:
             questions.append(question)
         
         # Create quiz
-        quiz_id = str(uuid.uuid4())
+        quiz_id = secrets.token_hex(8)
         quiz = Quiz(quiz_id, hsk_level, questions, quiz_type="multiple_choice")
-        self.active_quizzes[quiz_id] = quiz
+        self._add_active_quiz(quiz)
         
         return quiz
     
@@ -235,12 +264,14 @@ class QuizManager:
         else:  # translation
             # For translation, allow some flexibility
             # Split by commas to handle multiple acceptable answers
-            correct_answer = question['correct_answer'].lower()
+            # Normalised at generation time; worked out here for hand-built questions
+            acceptable_answers = question.get('acceptable_answers')
+            if acceptable_answers is None:
+                acceptable_answers = _acceptable_answers(question['correct_answer'])
             user_answer_lower = user_answer.lower()
-            acceptable_answers = [ans.strip().lower() for ans in correct_answer.split(',')]
             
+            # Containment either way also covers an exact match
             is_correct = any(
-                user_answer_lower == acceptable or 
                 user_answer_lower in acceptable or
                 acceptable in user_answer_lower
                 for acceptable in acceptable_answers
@@ -268,51 +299,52 @@ class QuizManager:
         Returns:
             Dictionary with results including score, feedback, and updated progress
         """
-        if quiz_id not in self.active_quizzes:
+        quiz = self.get_active_quiz(quiz_id)
+        if quiz is None:
             raise ValueError(f"Quiz {quiz_id} not found or already completed")
         
-        quiz = self.active_quizzes[quiz_id]
-        
         if len(answers) != len(quiz.questions):
             raise ValueError(
                 f"Expected {len(quiz.questions)} answers, got {len(answers)}"
             )
         
-        # Check each answer
-        results = []
-        correct_count = 0
+        # Score every answer up front (pure CPU), then write progress in one batch
+        scored = [
+            (question, answer, *self.check_answer(question, answer))
+            for question, answer in zip(quiz.questions, answers)
+        ]
+        correct_count = sum(is_correct for _, _, is_correct, _ in scored)
         
-        for i, (question, answer) in enumerate(zip(quiz.questions, answers)):
-            is_correct, feedback = self.check_answer(question, answer)
-            
-            if is_correct:
-                correct_count += 1
-            
-            results.append({
-                "question_number": i + 1,
+        results = [
+            {
+                "question_number": i,
                 "question": question['question'],
                 "user_answer": answer,
                 "correct_answer": question['correct_answer'],
                 "is_correct": is_correct,
                 "feedback": feedback
-            })
-            
-            # Update vocab progress
-            await self.db.update_progress(question['vocab_id'], correct=is_correct)
+            }
+            for i, (question, answer, is_correct, feedback) in enumerate(scored, 1)
+        ]
         
         # Calculate score
         total_questions = len(quiz.questions)
         score_percentage = (correct_count / total_questions * 100) if total_questions > 0 else 0
-        
-        # Record result in database
         duration = quiz.get_duration_seconds()
-        await self.db.record_quiz_result(
-            quiz_type=quiz.quiz_type,
-            hsk_level=quiz.hsk_level,
-            total_questions=total_questions,
-            correct_answers=correct_count,
-            duration_seconds=duration
-        )
+        
+        # Progress for every answer and the quiz result go in one transaction;
+        # on failure nothing is kept and the quiz stays active to resubmit
+        async with self.db.transaction():
+            await self.db.record_quiz_answers(
+                [(question['vocab_id'], is_correct) for question, _, is_correct, _ in scored]
+            )
+            await self.db.record_quiz_result(
+                quiz_type=quiz.quiz_type,
+                hsk_level=quiz.hsk_level,
+                total_questions=total_questions,
+                correct_answers=correct_count,
+                duration_seconds=duration
+            )
         
         # Mark quiz as completed and remove from active quizzes
         quiz.is_completed = True
@@ -329,37 +361,63 @@ class QuizManager:
         }
     
     def get_active_quiz(self, quiz_id: str) -> Optional[Quiz]:
-        """Get active quiz by ID."""
-        return self.active_quizzes.get(quiz_id)
+        """Get active quiz by ID, or None if it doesn't exist or has expired."""
+        quiz = self.active_quizzes.get(quiz_id)
+        if quiz is not None and quiz.is_expired():
+            del self.active_quizzes[quiz_id]
+            return None
+        return quiz
     
-    def format_quiz_for_display(self, quiz: Quiz) -> str:
+    def _add_active_quiz(self, quiz: Quiz) -> None:
+        """Track a new quiz, dropping expired quizzes and the oldest beyond the cap."""
+        while self.active_quizzes:
+            oldest = next(iter(self.active_quizzes.values()))
+            if not oldest.is_expired() and len(self.active_quizzes) < MAX_ACTIVE_QUIZZES:
+                break
+            self.active_quizzes.popitem(last=False)
+        
+        self.active_quizzes[quiz.quiz_id] = quiz
+    
+    def format_quiz_stream(self, quiz: Quiz) -> Iterator[str]:
         """
-        Format quiz for display to user.
+        Yield the display text for a quiz section by section.
         
         Args:
             quiz: Quiz object
         
-        Returns:
-            Formatted string
+        Yields:
+            Header, one block per question, then the submission hint
         """
-        output = f"📝 **Quiz #{quiz.quiz_id[:8]}** (HSK {quiz.hsk_level})\n"
-        output += f"Type: {quiz.quiz_type.replace('_', ' ').title()}\n"
-        output += f"Questions: {len(quiz.questions)}\n\n"
+        yield (
+            f"📝 **Quiz #{quiz.quiz_id[:8]}** (HSK {quiz.hsk_level})\n"
+            f"Type: {quiz.quiz_type.replace('_', ' ').title()}\n"
+            f"Questions: {len(quiz.questions)}\n\n"
+        )
         
         for i, question in enumerate(quiz.questions, 1):
-            output += f"**Question {i}:**\n"
-            output += f"{question['question']}\n"
+            block = [f"**Question {i}:**\n{question['question']}\n"]
             
             if question['question_type'] == "multiple_choice":
-                output += "\nChoices:\n"
+                block.append("\nChoices:\n")
                 for letter, choice in question['choices'].items():
-                    output += f"  {letter}. {choice}\n"
+                    block.append(f"  {letter}. {choice}\n")
             
-            output += "\n"
+            block.append("\n")
+            yield "".join(block)
+        
+        yield "💡 **To submit your answers, use the submit_quiz_answers tool with your answers as a list.**"
+    
+    def format_quiz_for_display(self, quiz: Quiz) -> str:
+        """
+        Format quiz for display to user.
         
-        output += "💡 **To submit your answers, use the submit_quiz_answers tool with your answers as a list.**"
+        Args:
+            quiz: Quiz object
         
-        return output
+        Returns:
+            Formatted string
+        """
+        return "".join(self.format_quiz_stream(quiz))
     
     def format_results_for_display(self, results: Dict[str, Any]) -> str:
         """
@@ -376,29 +434,24 @@ class QuizManager:
         total = results['total_questions']
         
         # Determine grade and emoji
-        if score >= 90:
-            grade = "Excellent! 🌟"
-        elif score >= 70:
-            grade = "Good job! ✅"
-        elif score >= 50:
-            grade = "Not bad! 📝"
-        else:
-            grade = "Keep practicing! 📚"
-        
-        output = f"""🎯 **Quiz Results**
+        grade = _GRADES[min(int(score) // 10, 10)]
+        
+        parts = [f"""🎯 **Quiz Results**
 
 **Score:** {correct}/{total} ({score}%)
 **Grade:** {grade}
 **Time:** {results['duration_seconds']} seconds
 
 **Detailed Results:**
-"""
+"""]
         
         for result in results['results']:
-            output += f"\n**Q{result['question_number']}:** {result['question']}\n"
-            output += f"  Your answer: {result['user_answer']}\n"
-            output += f"  {result['feedback']}\n"
+            parts.append(
+                f"\n**Q{result['question_number']}:** {result['question']}\n"
+                f"  Your answer: {result['user_answer']}\n"
+                f"  {result['feedback']}\n"
+            )
         
-        output += "\n💡 **Tip:** Your progress has been updated based on these results!"
+        parts.append("\n💡 **Tip:** Your progress has been updated based on these results!")
         
-        return output
\ No newline at end of file
+        return "".join(parts)
\ No newline at end of file
@@ -8,9 +8,66 @@ This module handles:
 - Managing vocabulary categories
 """
 
-import random
 from typing import List, Dict, Any, Optional
-from .database import MandarinDatabase
+from .database import MandarinDatabase, utc_timestamp, _WORDS_FOR_REVIEW_SQL
+
+# Shortest term the trigram full-text index can match
+_FTS_MIN_TERM_LENGTH = 3
+
+# Indexed by mastery level (0-5)
+_MASTERY_EMOJI = ("🔴", "🟠", "🟡", "🟢", "🔵", "⭐")
+
+# Due words within one HSK level. Unary + keeps the planner off
+# idx_vocabulary_hsk, so it walks idx_progress_due over due rows only (already
+# in review order) instead of every word in the level plus a sort.
+# Same columns as the unfiltered _WORDS_FOR_REVIEW_SQL.
+# Parameters: (hsk_level, now, limit)
+_REVIEW_BY_LEVEL_SQL = """
+    SELECT v.id, v.chinese, v.pinyin, v.english, v.hsk_level,
+           v.word_type, v.example_sentence,
+           up.mastery_level, up.times_seen, up.last_reviewed
+    FROM vocabulary v
+    INNER JOIN user_progress up ON v.id = up.vocabulary_id
+    WHERE +v.hsk_level = ? AND up.next_review <= ?
+    ORDER BY up.next_review ASC
+    LIMIT ?
+"""
+
+# Words at one mastery level, found through idx_progress_mastery.
+# Parameters: (mastery_level, limit)
+_MASTERY_SQL = """
+    SELECT v.*, up.mastery_level, up.times_seen, up.times_correct, up.times_incorrect
+    FROM vocabulary v
+    INNER JOIN user_progress up ON v.id = up.vocabulary_id
+    WHERE up.mastery_level = ?
+    LIMIT ?
+"""
+
+# As above within one HSK level. Parameters: (mastery_level, hsk_level, limit)
+_MASTERY_BY_LEVEL_SQL = """
+    SELECT v.*, up.mastery_level, up.times_seen, up.times_correct, up.times_incorrect
+    FROM vocabulary v
+    INNER JOIN user_progress up ON v.id = up.vocabulary_id
+    WHERE up.mastery_level = ? AND v.hsk_level = ?
+    LIMIT ?
+"""
+
+# Word-type browsing; idx_vocabulary_type(word_type, hsk_level, chinese)
+# serves both the filter and the ordering. Parameters: (word_type, limit)
+_WORD_TYPE_SQL = """
+    SELECT * FROM vocabulary
+    WHERE word_type = ?
+    ORDER BY hsk_level, chinese
+    LIMIT ?
+"""
+
+# As above within one HSK level. Parameters: (word_type, hsk_level, limit)
+_WORD_TYPE_BY_LEVEL_SQL = """
+    SELECT * FROM vocabulary
+    WHERE word_type = ? AND hsk_level = ?
+    ORDER BY chinese
+    LIMIT ?
+"""
 
 
 class VocabularyManager:
@@ -47,24 +104,28 @@ class VocabularyManager:
         Returns:
             List of vocab items
         """
-        # Get all vocab for the level
-        all_vocab = await self.db.get_vocabulary_by_hsk_level(hsk_level, limit=None)
-        
         if exclude_learned:
-            # Get list of vocab IDs the user has seen
-            cursor = await self.db._connection.execute(
-                "SELECT vocabulary_id FROM user_progress WHERE times_seen > 0"
-            )
-            learned_ids = {row[0] for row in await cursor.fetchall()}
-            
-            # Filter out learned vocab
-            new_vocab = [v for v in all_vocab if v['id'] not in learned_ids]
-        else:
-            new_vocab = all_vocab
+            # Anti-join in SQL so learned rows never leave the database
+            async with self.db.reader() as conn:
+                cursor = await conn.execute(
+                    """
+                    SELECT v.* FROM vocabulary v
+                    WHERE v.hsk_level = ?
+                    AND NOT EXISTS (
+                        SELECT 1 FROM user_progress up
+                        WHERE up.vocabulary_id = v.id AND up.times_seen > 0
+                    )
+                    ORDER BY RANDOM()
+                    LIMIT ?
+                    """,
+                    (hsk_level, count)
+                )
+                rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
         
-        # Shuffle and return requested count
-        random.shuffle(new_vocab)
-        return new_vocab[:count]
+        # Sampled from the vocabulary cache; copied to dicts to match the branch above
+        sample = await self.db.get_random_vocabulary_by_hsk_level(hsk_level, count)
+        return [dict(row) for row in sample]
     
     async def get_vocabulary_for_review(
         self,
@@ -81,34 +142,16 @@ class VocabularyManager:
         Returns:
             List of vocab items due for review
         """
-        if hsk_level:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT v.*, up.mastery_level, up.times_seen, up.last_reviewed
-                FROM vocabulary v
-                INNER JOIN user_progress up ON v.id = up.vocabulary_id
-                WHERE v.hsk_level = ? AND up.next_review <= datetime('now')
-                ORDER BY up.next_review ASC
-                LIMIT ?
-                """,
-                (hsk_level, count)
-            )
-        else:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT v.*, up.mastery_level, up.times_seen, up.last_reviewed
-                FROM vocabulary v
-                INNER JOIN user_progress up ON v.id = up.vocabulary_id
-                WHERE up.next_review <= datetime('now')
-                ORDER BY up.next_review ASC
-                LIMIT ?
-                """,
-                (count,)
-            )
-        
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        async with self.db.reader() as conn:
+            if hsk_level:
+                cursor = await conn.execute(
+                    _REVIEW_BY_LEVEL_SQL, (hsk_level, utc_timestamp(), count)
+                )
+            else:
+                cursor = await conn.execute(_WORDS_FOR_REVIEW_SQL, (utc_timestamp(), count))
+            
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
     
     async def get_vocabulary_by_mastery(
         self,
@@ -127,32 +170,16 @@ class VocabularyManager:
         Returns:
             List of vocab items at specified mastery level
         """
-        if hsk_level:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT v.*, up.mastery_level, up.times_seen, up.times_correct, up.times_incorrect
-                FROM vocabulary v
-                INNER JOIN user_progress up ON v.id = up.vocabulary_id
-                WHERE up.mastery_level = ? AND v.hsk_level = ?
-                LIMIT ?
-                """,
-                (mastery_level, hsk_level, limit)
-            )
-        else:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT v.*, up.mastery_level, up.times_seen, up.times_correct, up.times_incorrect
-                FROM vocabulary v
-                INNER JOIN user_progress up ON v.id = up.vocabulary_id
-                WHERE up.mastery_level = ?
-                LIMIT ?
-                """,
-                (mastery_level, limit)
-            )
-        
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        async with self.db.reader() as conn:
+            if hsk_level:
+                cursor = await conn.execute(
+                    _MASTERY_BY_LEVEL_SQL, (mastery_level, hsk_level, limit)
+                )
+            else:
+                cursor = await conn.execute(_MASTERY_SQL, (mastery_level, limit))
+            
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
     
     async def search_vocabulary(
         self,
@@ -169,31 +196,62 @@ class VocabularyManager:
         Returns:
             List of matching vocab items
         """
-        search_pattern = f"%{search_term}%"
+        if len(search_term) >= _FTS_MIN_TERM_LENGTH:
+            # Quoted as an FTS5 string so the term is matched literally
+            match = '"' + search_term.replace('"', '""') + '"'
+            
+            async with self.db.reader() as conn:
+                if hsk_level:
+                    cursor = await conn.execute(
+                        """
+                        SELECT v.* FROM vocabulary_fts f
+                        JOIN vocabulary v ON v.id = f.rowid
+                        WHERE vocabulary_fts MATCH ? AND v.hsk_level = ?
+                        ORDER BY v.hsk_level, v.chinese
+                        """,
+                        (match, hsk_level)
+                    )
+                else:
+                    cursor = await conn.execute(
+                        """
+                        SELECT v.* FROM vocabulary_fts f
+                        JOIN vocabulary v ON v.id = f.rowid
+                        WHERE vocabulary_fts MATCH ?
+                        ORDER BY v.hsk_level, v.chinese
+                        """,
+                        (match,)
+                    )
+                
+                rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
         
-        if hsk_level:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT * FROM vocabulary
-                WHERE (chinese LIKE ? OR pinyin LIKE ? OR english LIKE ?)
-                AND hsk_level = ?
-                ORDER BY hsk_level, chinese
-                """,
-                (search_pattern, search_pattern, search_pattern, hsk_level)
-            )
-        else:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT * FROM vocabulary
-                WHERE chinese LIKE ? OR pinyin LIKE ? OR english LIKE ?
-                ORDER BY hsk_level, chinese
-                """,
-                (search_pattern, search_pattern, search_pattern)
-            )
+        # Trigrams can't match one- or two-character terms (common for
+        # Chinese), so short searches scan with LIKE
+        search_pattern = f"%{search_term}%"
         
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        async with self.db.reader() as conn:
+            if hsk_level:
+                cursor = await conn.execute(
+                    """
+                    SELECT * FROM vocabulary
+                    WHERE (chinese LIKE ? OR pinyin LIKE ? OR english LIKE ?)
+                    AND hsk_level = ?
+                    ORDER BY hsk_level, chinese
+                    """,
+                    (search_pattern, search_pattern, search_pattern, hsk_level)
+                )
+            else:
+                cursor = await conn.execute(
+                    """
+                    SELECT * FROM vocabulary
+                    WHERE chinese LIKE ? OR pinyin LIKE ? OR english LIKE ?
+                    ORDER BY hsk_level, chinese
+                    """,
+                    (search_pattern, search_pattern, search_pattern)
+                )
+            
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
     
     async def get_vocabulary_by_word_type(
         self,
@@ -212,30 +270,16 @@ class VocabularyManager:
         Returns:
             List of vocab items of specified type
         """
-        if hsk_level:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT * FROM vocabulary
-                WHERE word_type = ? AND hsk_level = ?
-                ORDER BY chinese
-                LIMIT ?
-                """,
-                (word_type, hsk_level, limit)
-            )
-        else:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT * FROM vocabulary
-                WHERE word_type = ?
-                ORDER BY hsk_level, chinese
-                LIMIT ?
-                """,
-                (word_type, limit)
-            )
-        
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        async with self.db.reader() as conn:
+            if hsk_level:
+                cursor = await conn.execute(
+                    _WORD_TYPE_BY_LEVEL_SQL, (word_type, hsk_level, limit)
+                )
+            else:
+                cursor = await conn.execute(_WORD_TYPE_SQL, (word_type, limit))
+            
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
     
     async def get_vocabulary_statistics(self) -> Dict[str, Any]:
         """
@@ -247,40 +291,40 @@ class VocabularyManager:
             - Count per HSK level
             - Count per word type
         """
-        # Total vocab count
-        cursor = await self.db._connection.execute(
-            "SELECT COUNT(*) FROM vocabulary"
-        )
-        total_count = (await cursor.fetchone())[0]
-        
-        # Count per HSK level
-        cursor = await self.db._connection.execute(
-            """
-            SELECT hsk_level, COUNT(*) as count
-            FROM vocabulary
-            GROUP BY hsk_level
-            ORDER BY hsk_level
-            """
-        )
-        hsk_counts = {row[0]: row[1] for row in await cursor.fetchall()}
+        # All four aggregates in one round trip; each row is tagged with the
+        # statistic it belongs to. HSK levels come out in level order and word
+        # types most common first.
+        async with self.db.reader() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT kind, key, count FROM (
+                    SELECT 'total' AS kind, NULL AS key, COUNT(*) AS count FROM vocabulary
+                    UNION ALL
+                    SELECT 'hsk', hsk_level, COUNT(*) FROM vocabulary GROUP BY hsk_level
+                    UNION ALL
+                    SELECT 'type', word_type, COUNT(*) FROM vocabulary
+                    WHERE word_type IS NOT NULL GROUP BY word_type
+                    UNION ALL
+                    SELECT 'learned', NULL, COUNT(*) FROM user_progress WHERE times_seen > 0
+                )
+                ORDER BY kind, CASE kind WHEN 'hsk' THEN key ELSE -count END
+                """
+            )
+            rows = await cursor.fetchall()
         
-        # Count per word type
-        cursor = await self.db._connection.execute(
-            """
-            SELECT word_type, COUNT(*) as count
-            FROM vocabulary
-            WHERE word_type IS NOT NULL
-            GROUP BY word_type
-            ORDER BY count DESC
-            """
-        )
-        type_counts = {row[0]: row[1] for row in await cursor.fetchall()}
+        total_count = learned_count = 0
+        hsk_counts: Dict[int, int] = {}
+        type_counts: Dict[str, int] = {}
         
-        # Count learned vs new
-        cursor = await self.db._connection.execute(
-            "SELECT COUNT(DISTINCT vocabulary_id) FROM user_progress WHERE times_seen > 0"
-        )
-        learned_count = (await cursor.fetchone())[0]
+        for kind, key, count in rows:
+            if kind == 'hsk':
+                hsk_counts[key] = count
+            elif kind == 'type':
+                type_counts[key] = count
+            elif kind == 'total':
+                total_count = count
+            else:
+                learned_count = count
         
         return {
             "total_vocabulary": total_count,
@@ -305,29 +349,29 @@ class VocabularyManager:
         Returns:
             List of random vocab items
         """
-        if hsk_level:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT * FROM vocabulary
-                WHERE hsk_level = ?
-                ORDER BY RANDOM()
-                LIMIT ?
-                """,
-                (hsk_level, count)
-            )
-        else:
-            cursor = await self.db._connection.execute(
-                """
-                SELECT * FROM vocabulary
-                ORDER BY RANDOM()
-                LIMIT ?
-                """,
-                (count,)
-            )
-        
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        async with self.db.reader() as conn:
+            if hsk_level:
+                cursor = await conn.execute(
+                    """
+                    SELECT * FROM vocabulary
+                    WHERE hsk_level = ?
+                    ORDER BY RANDOM()
+                    LIMIT ?
+                    """,
+                    (hsk_level, count)
+                )
+            else:
+                cursor = await conn.execute(
+                    """
+                    SELECT * FROM vocabulary
+                    ORDER BY RANDOM()
+                    LIMIT ?
+                    """,
+                    (count,)
+                )
+            
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
     
     def format_vocabulary_for_display(
         self,
@@ -338,7 +382,7 @@ class VocabularyManager:
         Format vocab list for display to user.
         
         Args:
-            vocab_list: List of vocab dictionaries
+            vocab_list: List of vocab dictionaries or rows
             include_progress: Whether to include progress information
         
         Returns:
@@ -350,6 +394,10 @@ class VocabularyManager:
         output = []
         
         for i, vocab in enumerate(vocab_list, 1):
+            # Rows from the database layer may be aiosqlite.Row, which lacks .get();
+            # the manager's own queries already return dicts
+            if not isinstance(vocab, dict):
+                vocab = dict(vocab)
             line = f"**{i}. {vocab['chinese']}** ({vocab['pinyin']})"
             line += f"\n   📖 {vocab['english']}"
             
@@ -358,7 +406,7 @@ class VocabularyManager:
             
             if include_progress and 'mastery_level' in vocab:
                 mastery = vocab['mastery_level']
-                mastery_emoji = ["🔴", "🟠", "🟡", "🟢", "🔵", "⭐"][mastery]
+                mastery_emoji = _MASTERY_EMOJI[mastery]
                 line += f"\n   {mastery_emoji} Mastery: {mastery}/5"
                 
                 if vocab.get('times_seen'):
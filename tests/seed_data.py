@@ -0,0 +1,16 @@
+"""
+Shared test data.
+
+Test modules seed their fixtures with SEED_VOCAB plus any extra words
+their own tests need.
+"""
+
+# HSK 1 words every seeded fixture starts from: (chinese, pinyin, english,
+# hsk_level, word_type, example_sentence)
+SEED_VOCAB = (
+    ("你好", "nǐ hǎo", "hello", 1, "greeting", None),
+    ("谢谢", "xièxie", "thank you", 1, "expression", None),
+    ("再见", "zàijiàn", "goodbye", 1, "greeting", None),
+    ("学生", "xuésheng", "student", 1, "noun", None),
+    ("老师", "lǎoshī", "teacher", 1, "noun", None),
+)
@@ -9,24 +9,26 @@ These tests verify:
 - Statistics calculation
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 import pytest
-import os
-from pathlib import Path
-from mandarin_mcp_server.database import MandarinDatabase
+from mandarin_mcp_server.database import (
+    MandarinDatabase, REVIEW_INTERVAL_DAYS, utc_timestamp, _WORDS_FOR_REVIEW_SQL
+)
+from mandarin_mcp_server.vocabulary import (
+    _MASTERY_SQL, _MASTERY_BY_LEVEL_SQL, _WORD_TYPE_SQL, _WORD_TYPE_BY_LEVEL_SQL
+)
 
 
 @pytest.fixture
-async def test_db():
+async def test_db(tmp_path):
     """
     Fixture that provides clean test database for each test.
     
-    This creates temporary database, initialises it, and cleans up after test.
+    The database lives on disk (in pytest's per-test temporary directory) so
+    the WAL and reader-pool behaviour is exercised; other suites use :memory:.
     """
-    db_path = "test_mandarin.db"
-    
-    # Remove existing test database if it exists
-    if os.path.exists(db_path):
-        os.remove(db_path)
+    db_path = tmp_path / "test_mandarin.db"
     
     # Create and initialise database
     db = MandarinDatabase(db_path)
@@ -37,8 +39,6 @@ async def test_db():
     
     # Cleanup
     await db.close()
-    if os.path.exists(db_path):
-        os.remove(db_path)
 
 
 @pytest.mark.asyncio
@@ -52,12 +52,38 @@ async def test_database_initialisation(test_db):
         ORDER BY name
         """
     )
-    tables = [row[0] for row in await cursor.fetchall()]
+    tables = {row[0] for row in await cursor.fetchall()}
     
     # Check all expected tables exist
-    expected_tables = ['learning_sessions', 'quiz_results', 'user_progress', 'vocabulary']
-    assert all(table in tables for table in expected_tables), \
-        f"Missing tables. Expected {expected_tables}, got {tables}"
+    expected_tables = {'learning_sessions', 'quiz_results', 'user_progress', 'vocabulary'}
+    assert expected_tables <= tables, \
+        f"Missing tables: {expected_tables - tables}"
+
+
+@pytest.mark.asyncio
+async def test_full_text_index_backfilled(test_db):
+    """Test the search index is rebuilt for vocabulary that predates it."""
+    await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    
+    # Simulate a database created before the index existed
+    await test_db._connection.execute("DROP TABLE vocabulary_fts")
+    await test_db._connection.commit()
+    await test_db.initialise_schema()
+    
+    cursor = await test_db._connection.execute(
+        "SELECT rowid FROM vocabulary_fts WHERE vocabulary_fts MATCH ?", ('"hello"',)
+    )
+    assert len(await cursor.fetchall()) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_progress_keyed_by_vocabulary_id(test_db):
+    """Test that user_progress uses vocabulary_id as its primary key."""
+    cursor = await test_db._connection.execute("PRAGMA table_info(user_progress)")
+    columns = {row['name']: row['pk'] for row in await cursor.fetchall()}
+    
+    assert 'id' not in columns
+    assert columns['vocabulary_id'] == 1
 
 
 @pytest.mark.asyncio
@@ -97,9 +123,11 @@ async def test_add_vocabulary_invalid_hsk_level(test_db):
 async def test_get_vocabulary_by_level(test_db):
     """Test retrieving vocab filtered by HSK level."""
     # Add vocab at different levels
-    await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
-    await test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1)
-    await test_db.add_vocabulary("谢谢", "xièxie", "thank you", 2)
+    await asyncio.gather(
+        test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1),
+        test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1),
+        test_db.add_vocabulary("谢谢", "xièxie", "thank you", 2),
+    )
     
     # Test HSK 1
     hsk1_vocab = await test_db.get_vocabulary_by_hsk_level(1)
@@ -115,6 +143,25 @@ async def test_get_vocabulary_by_level(test_db):
     assert len(limited_vocab) == 1
 
 
+@pytest.mark.asyncio
+async def test_get_random_vocabulary_by_level(test_db):
+    """Test random sampling stays within the level and caps at its size."""
+    await asyncio.gather(
+        test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1),
+        test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1),
+        test_db.add_vocabulary("谢谢", "xièxie", "thank you", 2),
+    )
+    
+    sample = await test_db.get_random_vocabulary_by_hsk_level(1, 1)
+    assert len(sample) == 1
+    assert sample[0]['hsk_level'] == 1
+    
+    everything = await test_db.get_random_vocabulary_by_hsk_level(1, 10)
+    assert {row['chinese'] for row in everything} == {"你好", "再见"}
+    
+    assert await test_db.get_random_vocabulary_by_hsk_level(5, 3) == []
+
+
 @pytest.mark.asyncio
 async def test_update_progress_new_word(test_db):
     """Test creating progress entry for new word."""
@@ -126,16 +173,17 @@ async def test_update_progress_new_word(test_db):
     
     # Verify progress was recorded
     cursor = await test_db._connection.execute(
-        "SELECT * FROM user_progress WHERE vocabulary_id = ?",
+        "SELECT mastery_level, times_seen, times_correct, times_incorrect FROM user_progress WHERE vocabulary_id = ?",
         (vocab_id,)
     )
     progress = await cursor.fetchone()
     
     assert progress is not None, "Progress should be recorded"
-    assert progress[2] == 1, "Mastery level should be 1 for first correct answer"
-    assert progress[3] == 1, "Times seen should be 1"
-    assert progress[4] == 1, "Times correct should be 1"
-    assert progress[5] == 0, "Times incorrect should be 0"
+    mastery, seen, correct, incorrect = progress
+    assert mastery == 1, "Mastery level should be 1 for first correct answer"
+    assert seen == 1, "Times seen should be 1"
+    assert correct == 1, "Times correct should be 1"
+    assert incorrect == 0, "Times incorrect should be 0"
 
 
 @pytest.mark.asyncio
@@ -188,16 +236,19 @@ async def test_get_progress_stats_empty(test_db):
     assert stats['total_words_studied'] == 0
     assert stats['total_reviews'] == 0
     assert stats['accuracy'] == 0
+    assert stats['mastery_breakdown'] == (0, 0, 0, 0, 0, 0)
 
 
 @pytest.mark.asyncio
 async def test_get_progress_stats_with_data(test_db):
     """Test statistics calculation with actual progress data."""
     # Add multiple vocab items and create progress
-    vocab_id_1 = await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
-    vocab_id_2 = await test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1)
+    vocab_id_1, vocab_id_2 = await asyncio.gather(
+        test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1),
+        test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1),
+    )
     
-    # Create varied progress
+    # Create varied progress; updates to the same word must stay in order
     await test_db.update_progress(vocab_id_1, correct=True)
     await test_db.update_progress(vocab_id_1, correct=True)
     await test_db.update_progress(vocab_id_2, correct=False)
@@ -210,6 +261,7 @@ async def test_get_progress_stats_with_data(test_db):
     assert stats['total_correct'] == 3
     assert stats['total_incorrect'] == 1
     assert stats['accuracy'] == 75.0
+    assert stats['mastery_breakdown'] == (0, 1, 1, 0, 0, 0)
 
 
 @pytest.mark.asyncio
@@ -248,16 +300,11 @@ async def test_get_quiz_history(test_db):
         )
         quiz_ids.append(quiz_id)
     
-    print(f"\nQuiz IDs created: {quiz_ids}")
-    
-    # Get all history to debug
-    all_history = await test_db.get_quiz_history(limit=10)
-    print(f"All history returned: {[(h['id'], h['correct_answers']) for h in all_history]}")
-    
-    # Get limited history
+    # Limit applies
     history = await test_db.get_quiz_history(limit=3)
     assert len(history) == 3, f"Expected 3 results, got {len(history)}"
     
+    all_history = await test_db.get_quiz_history(limit=10)
     assert len(all_history) == 5, f"Expected 5 total results, got {len(all_history)}"
     
     # The most recent (last added) should be first in results
@@ -312,12 +359,305 @@ async def test_get_words_for_review(test_db):
     
     # Manually set next_review to past date for testing
     await test_db._connection.execute(
-        "UPDATE user_progress SET next_review = datetime('now', '-1 day') WHERE vocabulary_id = ?",
-        (vocab_id,)
+        "UPDATE user_progress SET next_review = ? WHERE vocabulary_id = ?",
+        ("2000-01-01 00:00:00", vocab_id)
     )
     await test_db._connection.commit()
     
     # Now should appear
     words_due = await test_db.get_words_for_review()
     assert len(words_due) == 1
-    assert words_due[0]['chinese'] == "你好"
\ No newline at end of file
+    assert words_due[0]['chinese'] == "你好"
+
+
+@pytest.mark.asyncio
+async def test_connect_applies_pragmas(test_db):
+    """Test that performance PRAGMAs are applied on connect."""
+    cursor = await test_db._connection.execute("PRAGMA journal_mode")
+    assert (await cursor.fetchone())[0] == "wal"
+    
+    cursor = await test_db._connection.execute("PRAGMA synchronous")
+    assert (await cursor.fetchone())[0] == 1  # NORMAL
+    
+    cursor = await test_db._connection.execute("PRAGMA foreign_keys")
+    assert (await cursor.fetchone())[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_add_vocabulary_bulk(test_db):
+    """Test bulk inserting vocab skips duplicates."""
+    rows = [
+        ("你好", "nǐ hǎo", "hello", 1, "greeting", None),
+        ("再见", "zàijiàn", "goodbye", 1, "greeting", None),
+        ("你好", "nǐ hǎo", "hello", 1, "greeting", None),  # Duplicate
+    ]
+    
+    added = await test_db.add_vocabulary_bulk(rows)
+    assert added == 2
+    
+    vocab_list = await test_db.get_vocabulary_by_hsk_level(1)
+    assert len(vocab_list) == 2
+    
+    with pytest.raises(ValueError, match="HSK level must be between 1 and 6"):
+        await test_db.add_vocabulary_bulk([("测试", "cèshì", "test", 7, None, None)])
+
+
+@pytest.mark.asyncio
+async def test_vocab_cache_sees_other_connections(test_db):
+    """Test vocabulary committed by another connection reaches the cache."""
+    await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    assert len(await test_db.get_vocabulary_by_hsk_level(1)) == 1
+    
+    # e.g. load_vocabulary.py run against the file while the server is up
+    other = MandarinDatabase(test_db.db_path)
+    await other.connect()
+    await other.add_vocabulary("再见", "zàijiàn", "goodbye", 1)
+    await other.close()
+    
+    vocab = await test_db.get_vocabulary_by_hsk_level(1)
+    assert {row['chinese'] for row in vocab} == {"你好", "再见"}
+
+
+@pytest.mark.asyncio
+async def test_vocab_cache_discards_load_overlapping_commit(test_db):
+    """Test a cache load that a vocabulary commit overlaps isn't kept."""
+    await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    original_reader = test_db.reader
+    
+    @asynccontextmanager
+    async def reader_with_concurrent_write():
+        async with original_reader() as conn:
+            # Lands after the load started, before its snapshot is stored
+            await test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1)
+            yield conn
+    
+    test_db.reader = reader_with_concurrent_write
+    await test_db.get_vocabulary_by_hsk_level(1)
+    del test_db.reader
+    
+    assert test_db._vocab_cache is None
+    assert len(await test_db.get_vocabulary_by_hsk_level(1)) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_use_reader_pool(test_db):
+    """Test that concurrent reads are served by the reader pool."""
+    await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    assert len(test_db._readers) == test_db.read_pool_size
+    
+    results = await asyncio.gather(
+        *(test_db.get_vocabulary_by_hsk_level(1) for _ in range(10))
+    )
+    assert all(len(vocab) == 1 for vocab in results)
+    
+    # Every reader is returned to the pool afterwards
+    assert test_db._reader_queue.qsize() == test_db.read_pool_size
+
+
+@pytest.mark.asyncio
+async def test_in_memory_database_skips_reader_pool():
+    """Test that in-memory databases read through the writer connection."""
+    db = MandarinDatabase(":memory:")
+    await db.connect()
+    await db.initialise_schema()
+    
+    await db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    assert db._readers == []
+    assert len(await db.get_vocabulary_by_hsk_level(1)) == 1
+    
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_update_progress_schedules_next_review(test_db):
+    """Test that next review interval follows the mastery level."""
+    vocab_id = await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    
+    # New entry is always reviewed the next day
+    await test_db.update_progress(vocab_id, correct=False)
+    
+    # Climb through every mastery level (and one past the cap)
+    for expected_mastery in [1, 2, 3, 4, 5, 5]:
+        await test_db.update_progress(vocab_id, correct=True)
+        
+        cursor = await test_db._connection.execute(
+            """
+            SELECT mastery_level, julianday(next_review) - julianday(last_reviewed)
+            FROM user_progress WHERE vocabulary_id = ?
+            """,
+            (vocab_id,)
+        )
+        mastery, days = await cursor.fetchone()
+        
+        assert mastery == expected_mastery
+        assert days == pytest.approx(REVIEW_INTERVAL_DAYS[mastery], abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_words_for_review_uses_covering_index(test_db):
+    """Test that the due-review query is served by the covering index."""
+    cursor = await test_db._connection.execute(
+        "EXPLAIN QUERY PLAN " + _WORDS_FOR_REVIEW_SQL,
+        (utc_timestamp(), 10)
+    )
+    plan = " ".join(row[3] for row in await cursor.fetchall())
+    
+    assert "COVERING INDEX idx_progress_due" in plan
+
+
+@pytest.mark.asyncio
+async def test_utc_timestamp_matches_sqlite_clock(test_db):
+    """Test the bound review timestamp compares like SQLite's datetime('now')."""
+    cursor = await test_db._connection.execute(
+        "SELECT (julianday(datetime('now')) - julianday(?)) * 86400, length(?) = length(datetime('now'))",
+        (utc_timestamp(), utc_timestamp())
+    )
+    seconds_apart, same_format = await cursor.fetchone()
+    
+    assert abs(seconds_apart) < 5
+    assert same_format
+
+
+@pytest.mark.asyncio
+async def test_mastery_query_uses_index(test_db):
+    """Test that filtering by mastery level is an index lookup joined by primary key."""
+    cursor = await test_db._connection.execute(
+        "EXPLAIN QUERY PLAN " + _MASTERY_SQL, (1, 10)
+    )
+    plan = " ".join(row[3] for row in await cursor.fetchall())
+    
+    assert "INDEX idx_progress_mastery" in plan
+    assert "SCAN" not in plan
+    
+    # With a level filter either side can drive the join, but neither is scanned
+    cursor = await test_db._connection.execute(
+        "EXPLAIN QUERY PLAN " + _MASTERY_BY_LEVEL_SQL, (1, 1, 10)
+    )
+    plan = " ".join(row[3] for row in await cursor.fetchall())
+    assert "SCAN" not in plan
+
+
+@pytest.mark.asyncio
+async def test_word_type_query_uses_index(test_db):
+    """Test that word-type browsing is an index search with no separate sort."""
+    for sql, params in (
+        (_WORD_TYPE_BY_LEVEL_SQL, ("noun", 1, 20)),
+        (_WORD_TYPE_SQL, ("noun", 20)),
+    ):
+        cursor = await test_db._connection.execute("EXPLAIN QUERY PLAN " + sql, params)
+        plan = " ".join(row[3] for row in await cursor.fetchall())
+        
+        assert "USING INDEX idx_vocabulary_type" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_get_vocabulary_keys(test_db):
+    """Test retrieving existing (chinese, hsk_level) keys."""
+    await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    await test_db.add_vocabulary("谢谢", "xièxie", "thank you", 2)
+    
+    keys = await test_db.get_vocabulary_keys()
+    assert keys == {("你好", 1), ("谢谢", 2)}
+
+
+@pytest.mark.asyncio
+async def test_record_quiz_answers(test_db):
+    """Test batch progress updates match individual updates."""
+    vocab_id_1 = await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    vocab_id_2 = await test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1)
+    
+    await test_db.record_quiz_answers([
+        (vocab_id_1, True),
+        (vocab_id_2, False),
+        (vocab_id_1, True),  # Same word twice in one batch
+    ])
+    
+    cursor = await test_db._connection.execute(
+        "SELECT vocabulary_id, mastery_level, times_seen FROM user_progress ORDER BY vocabulary_id"
+    )
+    rows = [tuple(row) for row in await cursor.fetchall()]
+    
+    assert rows == [(vocab_id_1, 2, 2), (vocab_id_2, 0, 1)]
+
+
+@pytest.mark.asyncio
+async def test_vocabulary_cache_invalidated_on_add(test_db):
+    """Test that cached vocab is refreshed when new vocab is added."""
+    await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    assert len(await test_db.get_vocabulary_by_hsk_level(1)) == 1
+    assert test_db._vocab_cache is not None
+    
+    await test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1)
+    assert test_db._vocab_cache is None
+    assert len(await test_db.get_vocabulary_by_hsk_level(1)) == 2
+    
+    # Callers get their own list, so mutating it leaves the cache intact
+    vocab_list = await test_db.get_vocabulary_by_hsk_level(1)
+    vocab_list.clear()
+    assert len(await test_db.get_vocabulary_by_hsk_level(1)) == 2
+
+
+@pytest.mark.asyncio
+async def test_analyse_collects_statistics(test_db):
+    """Test that analyse() populates planner statistics."""
+    await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    await test_db.analyse()
+    
+    cursor = await test_db._connection.execute(
+        "SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'vocabulary'"
+    )
+    assert (await cursor.fetchone())[0] > 0
+
+
+@pytest.mark.asyncio
+async def test_transaction_groups_writes(test_db):
+    """Test that writes inside transaction() are committed together at the end."""
+    async with test_db.transaction():
+        await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+        await test_db.record_quiz_result("vocabulary", 1, 10, 8)
+        assert test_db._connection.in_transaction
+    
+    assert not test_db._connection.in_transaction
+    assert len(await test_db.get_vocabulary_by_hsk_level(1)) == 1
+    assert len(await test_db.get_quiz_history()) == 1
+
+
+@pytest.mark.asyncio
+async def test_transaction_rolls_back_on_error(test_db):
+    """Test that a failing transaction() keeps none of its writes."""
+    with pytest.raises(RuntimeError):
+        async with test_db.transaction():
+            await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+            await test_db.record_quiz_result("vocabulary", 1, 10, 8)
+            raise RuntimeError("disk full")
+    
+    assert not test_db._connection.in_transaction
+    assert await test_db.get_vocabulary_by_hsk_level(1) == []
+    assert len(await test_db.get_quiz_history()) == 0
+
+
+@pytest.mark.asyncio
+async def test_transaction_isolated_from_concurrent_writes(test_db):
+    """Test that a rolled-back transaction doesn't take another task's commit with it."""
+    vocab_id_1 = await test_db.add_vocabulary("你好", "nǐ hǎo", "hello", 1)
+    vocab_id_2 = await test_db.add_vocabulary("再见", "zàijiàn", "goodbye", 1)
+    
+    async def failing_submit():
+        async with test_db.transaction():
+            await test_db.record_quiz_answers([(vocab_id_1, True)])
+            # Give the other task a chance to write while this one is open
+            await asyncio.sleep(0.01)
+            raise RuntimeError("disk full")
+    
+    async def good_submit():
+        await asyncio.sleep(0)
+        await test_db.record_quiz_answers([(vocab_id_2, True)])
+    
+    results = await asyncio.gather(failing_submit(), good_submit(), return_exceptions=True)
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] is None
+    
+    cursor = await test_db._connection.execute("SELECT vocabulary_id FROM user_progress")
+    assert [row[0] for row in await cursor.fetchall()] == [vocab_id_2]
+    assert not test_db._connection.in_transaction
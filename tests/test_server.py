@@ -7,55 +7,127 @@ These tests verify that:
 - Tool handlers work as expected
 """
 
+import re
 import pytest
-import os
+from mcp.types import CallToolRequest, CallToolRequestParams, ListToolsRequest
 from mandarin_mcp_server.server import MandarinMCPServer
+from tests.seed_data import SEED_VOCAB
+
+
+# take_quiz shows the ID on its own line for the client to pass back
+_QUIZ_ID_RE = re.compile(r"^\*\*Quiz ID:\*\* `([^`]+)`$", re.MULTILINE)
+
+
+def _quiz_id_from(result) -> str:
+    """Read the quiz ID from a take_quiz response."""
+    match = _QUIZ_ID_RE.search(result[0].text)
+    assert match, "take_quiz response should show the quiz ID"
+    return match.group(1)
 
 
 @pytest.fixture
-async def test_server():
-    """Fixture that provides a test server instance."""
-    db_path = "test_server.db"
-    
-    # Remove existing test database
-    if os.path.exists(db_path):
-        os.remove(db_path)
+async def bare_server():
+    """Fixture that provides a test server instance with an empty vocabulary."""
+    # In-memory database: nothing touches disk and there is nothing to clean up
+    db_path = ":memory:"
     
     # Create server
     server = MandarinMCPServer(db_path)
     await server.db.connect()
     await server.db.initialise_schema()
     
-    # Add some test vocab
-    await server.db.add_vocabulary("你好", "nǐ hǎo", "hello", 1, "greeting")
-    await server.db.add_vocabulary("谢谢", "xièxie", "thank you", 1, "expression")
-    await server.db.add_vocabulary("再见", "zàijiàn", "goodbye", 1, "greeting")
-    
     yield server
     
     # Cleanup
     await server.db.close()
-    if os.path.exists(db_path):
-        os.remove(db_path)
+
+
+@pytest.fixture
+async def test_server(bare_server):
+    """Fixture that provides a test server instance with some HSK 1 vocab."""
+    await bare_server.db.add_vocabulary_bulk(SEED_VOCAB)
+    
+    return bare_server
 
 
 @pytest.mark.asyncio
-async def test_server_initialisation(test_server):
+async def test_server_initialisation(bare_server):
     """Test that server initialises with database connection."""
-    assert test_server.db._connection is not None
-    assert test_server.server is not None
+    assert bare_server.db._connection is not None
+    assert bare_server.server is not None
 
 
 @pytest.mark.asyncio
-async def test_get_progress_stats(test_server):
+async def test_list_tools(bare_server):
+    """Test that all tools are listed."""
+    handler = bare_server.server.request_handlers[ListToolsRequest]
+    result = await handler(ListToolsRequest(method="tools/list"))
+    tool_names = {tool.name for tool in result.root.tools}
+    
+    assert "get_progress_stats" in tool_names
+    assert "take_quiz" in tool_names
+    assert "clear_progress" in tool_names
+    assert len(tool_names) == 10
+    
+    # Every listed tool has a handler
+    assert tool_names == set(bare_server._dispatch)
+
+
+@pytest.mark.asyncio
+async def test_call_tool_response_serialises(test_server):
+    """Test handler responses survive the MCP request path and serialise."""
+    handler = test_server.server.request_handlers[CallToolRequest]
+    request = CallToolRequest(
+        method="tools/call",
+        params=CallToolRequestParams(name="get_vocabulary_by_level", arguments={"hsk_level": 1})
+    )
+    result = await handler(request)
+    payload = result.root.model_dump(mode="json")
+    
+    assert payload["content"][0]["type"] == "text"
+    assert "你好" in payload["content"][0]["text"]
+
+
+@pytest.mark.asyncio
+async def test_call_tool_without_arguments(bare_server):
+    """Test no-argument tools can be called with arguments omitted."""
+    handler = bare_server.server.request_handlers[CallToolRequest]
+    request = CallToolRequest(
+        method="tools/call",
+        params=CallToolRequestParams(name="get_progress_stats")
+    )
+    result = await handler(request)
+    
+    assert not result.root.isError
+    assert "Learning Progress Statistics" in result.root.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_get_progress_stats(bare_server):
     """Test get_progress_stats tool."""
-    result = await test_server._handle_get_progress_stats()
+    result = await bare_server._handle_get_progress_stats({})
     
     assert len(result) == 1
     assert "Learning Progress Statistics" in result[0].text
     assert "Words Studied:" in result[0].text
 
 
+@pytest.mark.asyncio
+async def test_get_progress_stats_mastery_breakdown(test_server):
+    """Test mastery breakdown lists only levels with words, in level order."""
+    await test_server.db.update_progress(1, correct=True)
+    await test_server.db.update_progress(1, correct=True)
+    await test_server.db.update_progress(2, correct=True)
+    
+    result = await test_server._handle_get_progress_stats({})
+    text = result[0].text
+    
+    assert "Learning: 1 words" in text
+    assert "Familiar: 1 words" in text
+    assert "New/Struggling" not in text
+    assert text.index("Learning:") < text.index("Familiar:")
+
+
 @pytest.mark.asyncio
 async def test_learn_vocabulary(test_server):
     """Test learn_vocabulary tool."""
@@ -65,7 +137,9 @@ async def test_learn_vocabulary(test_server):
     assert len(result) == 1
     # Updated to match new message format
     assert "Learning New HSK 1 Vocabulary" in result[0].text
-    assert "你好" in result[0].text or "谢谢" in result[0].text
+    # Two of the seeded words, picked at random
+    shown = [row[0] for row in SEED_VOCAB if f". {row[0]}**" in result[0].text]
+    assert len(shown) == 2
 
 
 @pytest.mark.asyncio
@@ -93,20 +167,48 @@ async def test_get_vocabulary_by_level(test_server):
 
 
 @pytest.mark.asyncio
-async def test_get_quiz_history_empty(test_server):
+async def test_get_vocabulary_by_level_cached(test_server, monkeypatch):
+    """Test formatted level output is reused until the vocabulary changes."""
+    format_calls = []
+    original_format = test_server.vocab_manager.format_vocabulary_for_display
+    
+    def counting_format(*args):
+        format_calls.append(args)
+        return original_format(*args)
+    
+    monkeypatch.setattr(test_server.vocab_manager, "format_vocabulary_for_display", counting_format)
+    arguments = {"hsk_level": 1, "limit": 10}
+    
+    first = await test_server._handle_get_vocabulary_by_level(arguments)
+    second = await test_server._handle_get_vocabulary_by_level(arguments)
+    assert first[0].text == second[0].text
+    assert len(format_calls) == 1
+    
+    # A different limit is a different response
+    await test_server._handle_get_vocabulary_by_level({"hsk_level": 1, "limit": 1})
+    assert len(format_calls) == 2
+    
+    await test_server.db.add_vocabulary("朋友", "péngyou", "friend", 1, "noun")
+    third = await test_server._handle_get_vocabulary_by_level(arguments)
+    assert "朋友" in third[0].text
+    assert len(format_calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_quiz_history_empty(bare_server):
     """Test quiz history when no quizzes have been taken."""
     arguments = {"limit": 10}
-    result = await test_server._handle_get_quiz_history(arguments)
+    result = await bare_server._handle_get_quiz_history(arguments)
     
     assert len(result) == 1
     assert "No quiz history" in result[0].text
 
 
 @pytest.mark.asyncio
-async def test_get_quiz_history_with_data(test_server):
+async def test_get_quiz_history_with_data(bare_server):
     """Test quiz history with actual quiz data."""
     # Add a quiz result
-    await test_server.db.record_quiz_result(
+    await bare_server.db.record_quiz_result(
         quiz_type="vocabulary",
         hsk_level=1,
         total_questions=5,
@@ -114,7 +216,7 @@ async def test_get_quiz_history_with_data(test_server):
     )
     
     arguments = {"limit": 10}
-    result = await test_server._handle_get_quiz_history(arguments)
+    result = await bare_server._handle_get_quiz_history(arguments)
     
     assert len(result) == 1
     assert "Quiz History" in result[0].text
@@ -122,10 +224,28 @@ async def test_get_quiz_history_with_data(test_server):
 
 
 @pytest.mark.asyncio
-async def test_clear_progress_without_confirm(test_server):
+async def test_get_quiz_history_score_emoji(bare_server):
+    """Test quiz history emoji thresholds at 50, 70 and 90 percent."""
+    for correct in (49, 50, 70, 90, 100):
+        await bare_server.db.record_quiz_result(
+            quiz_type="vocabulary",
+            hsk_level=1,
+            total_questions=100,
+            correct_answers=correct
+        )
+    
+    result = await bare_server._handle_get_quiz_history({"limit": 10})
+    lines = [line for line in result[0].text.splitlines() if "**HSK" in line]
+    emojis = {line.split("/100")[0].rsplit(" ", 1)[1]: line[0] for line in lines}
+    
+    assert emojis == {"49": "📚", "50": "📝", "70": "✅", "90": "🌟", "100": "🌟"}
+
+
+@pytest.mark.asyncio
+async def test_clear_progress_without_confirm(bare_server):
     """Test that clear_progress requires confirmation."""
     arguments = {"confirm": False}
-    result = await test_server._handle_clear_progress(arguments)
+    result = await bare_server._handle_clear_progress(arguments)
     
     assert len(result) == 1
     assert "cancelled" in result[0].text.lower()
@@ -165,7 +285,7 @@ async def test_take_quiz(test_server):
     assert "Question 1:" in result[0].text
     assert "Quiz ID:" in result[0].text
     # Verify pinyin is included
-    assert "(" in result[0].text and ")" in result[0].text  # Pinyin is in parentheses
+    assert re.search(r"\([^)]+\)", result[0].text)  # Pinyin is in parentheses
 
 
 @pytest.mark.asyncio
@@ -175,9 +295,7 @@ async def test_submit_quiz_answers(test_server):
     quiz_args = {"hsk_level": 1, "num_questions": 2}
     quiz_result = await test_server._handle_take_quiz(quiz_args)
     
-    # Extract quiz ID from the response
-    quiz_text = quiz_result[0].text
-    quiz_id = quiz_text.split("Quiz ID:** `")[1].split("`")[0]
+    quiz_id = _quiz_id_from(quiz_result)
     
     # Get the quiz to see correct answers
     quiz = test_server.quiz_manager.get_active_quiz(quiz_id)
@@ -205,9 +323,7 @@ async def test_submit_quiz_answers_with_incorrect_answers(test_server):
     quiz_args = {"hsk_level": 1, "num_questions": 3}
     quiz_result = await test_server._handle_take_quiz(quiz_args)
     
-    # Extract quiz ID
-    quiz_text = quiz_result[0].text
-    quiz_id = quiz_text.split("Quiz ID:** `")[1].split("`")[0]
+    quiz_id = _quiz_id_from(quiz_result)
     
     # Submit wrong answers
     wrong_answers = ["wrong1", "wrong2", "wrong3"]
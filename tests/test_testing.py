@@ -8,21 +8,28 @@ These tests verify:
 - Progress tracking from quiz results
 """
 
+import asyncio
 import pytest
-import os
 from mandarin_mcp_server.database import MandarinDatabase
 from mandarin_mcp_server.vocabulary import VocabularyManager
-from mandarin_mcp_server.testing import QuizManager, Quiz
+from mandarin_mcp_server import testing
+from mandarin_mcp_server.testing import QuizManager
+from tests.seed_data import SEED_VOCAB
+
+
+# Seed vocab plus more HSK 1 words for larger quizzes
+_TEST_VOCAB = SEED_VOCAB + (
+    ("好", "hǎo", "good", 1, "adjective", None),
+    ("人", "rén", "person, people", 1, "noun", None),
+    ("中国", "Zhōngguó", "China", 1, "noun", None),
+)
 
 
 @pytest.fixture
 async def quiz_manager():
     """Fixture that provides quiz manager with test data."""
-    db_path = "test_quiz.db"
-    
-    # Remove existing test database
-    if os.path.exists(db_path):
-        os.remove(db_path)
+    # In-memory database: nothing touches disk and there is nothing to clean up
+    db_path = ":memory:"
     
     # Create database and managers
     db = MandarinDatabase(db_path)
@@ -30,19 +37,7 @@ async def quiz_manager():
     await db.initialise_schema()
     
     # Add test vocab
-    test_vocab = [
-        ("你好", "nǐ hǎo", "hello", 1, "greeting"),
-        ("谢谢", "xièxie", "thank you", 1, "expression"),
-        ("再见", "zàijiàn", "goodbye", 1, "greeting"),
-        ("学生", "xuésheng", "student", 1, "noun"),
-        ("老师", "lǎoshī", "teacher", 1, "noun"),
-        ("好", "hǎo", "good", 1, "adjective"),
-        ("人", "rén", "person, people", 1, "noun"),
-        ("中国", "Zhōngguó", "China", 1, "noun"),
-    ]
-    
-    for chinese, pinyin, english, level, word_type in test_vocab:
-        await db.add_vocabulary(chinese, pinyin, english, level, word_type)
+    await db.add_vocabulary_bulk(_TEST_VOCAB)
     
     vocab_manager = VocabularyManager(db)
     manager = QuizManager(db, vocab_manager)
@@ -51,8 +46,6 @@ async def quiz_manager():
     
     # Cleanup
     await db.close()
-    if os.path.exists(db_path):
-        os.remove(db_path)
 
 
 @pytest.mark.asyncio
@@ -112,6 +105,22 @@ async def test_generate_multiple_choice_quiz(quiz_manager):
         assert question['correct_answer'] in ['A', 'B', 'C', 'D']
 
 
+@pytest.mark.asyncio
+async def test_multiple_choice_distractors_are_distinct_words(quiz_manager):
+    """Test the correct letter points at the answer and distractors are other words."""
+    quiz = await quiz_manager.generate_multiple_choice_quiz(hsk_level=1, num_questions=8)
+    vocab = {row['id']: row['english'] for row in await quiz_manager.db.get_vocabulary_by_hsk_level(1)}
+    
+    for question in quiz.questions:
+        choices = question['choices']
+        answer = vocab[question['vocab_id']]
+        assert choices[question['correct_answer']] == answer
+        
+        distractors = [c for letter, c in choices.items() if letter != question['correct_answer']]
+        assert answer not in distractors
+        assert len(set(distractors)) == 3
+
+
 @pytest.mark.asyncio
 async def test_check_answer_translation_correct(quiz_manager):
     """Test checking correct translation answer."""
@@ -158,6 +167,17 @@ async def test_check_answer_multiple_acceptable(quiz_manager):
     assert is_correct2 is True
 
 
+@pytest.mark.asyncio
+async def test_generated_questions_precompute_acceptable_answers(quiz_manager):
+    """Test generated translation questions carry their normalised answers."""
+    quiz = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=8)
+    question = next(q for q in quiz.questions if q['chinese'] == "人")
+    
+    assert question['acceptable_answers'] == ("person", "people")
+    assert quiz_manager.check_answer(question, " People ")[0] is True
+    assert quiz_manager.check_answer(question, "teacher")[0] is False
+
+
 @pytest.mark.asyncio
 async def test_check_answer_multiple_choice_correct(quiz_manager):
     """Test checking correct multiple choice answer."""
@@ -282,6 +302,67 @@ async def test_quiz_records_to_database(quiz_manager):
     assert history[0]['correct_answers'] == 2
 
 
+@pytest.mark.asyncio
+async def test_submit_quiz_rolls_back_on_failure(quiz_manager, monkeypatch):
+    """Test that a failed submission keeps no partial progress."""
+    quiz = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=2)
+    answers = [q['correct_answer'] for q in quiz.questions]
+    
+    async def failing_record_quiz_result(**kwargs):
+        raise RuntimeError("disk full")
+    
+    monkeypatch.setattr(quiz_manager.db, "record_quiz_result", failing_record_quiz_result)
+    with pytest.raises(RuntimeError):
+        await quiz_manager.submit_quiz(quiz.quiz_id, answers)
+    
+    # The answers written before the failure were discarded
+    stats = await quiz_manager.db.get_progress_stats()
+    assert stats['total_words_studied'] == 0
+    
+    # A later commit doesn't pick up the discarded answers
+    await quiz_manager.db.record_quiz_answers([(quiz.questions[0]['vocab_id'], False)])
+    stats = await quiz_manager.db.get_progress_stats()
+    assert stats['total_words_studied'] == 1
+    assert stats['total_correct'] == 0
+    
+    # The quiz is still active, so it can be resubmitted
+    monkeypatch.undo()
+    results = await quiz_manager.submit_quiz(quiz.quiz_id, answers)
+    assert results['correct_answers'] == 2
+    assert len(await quiz_manager.db.get_quiz_history(limit=5)) == 1
+
+
+@pytest.mark.asyncio
+async def test_overlapping_submits_one_failing(quiz_manager, monkeypatch):
+    """Test that a failed submit neither loses nor leaks into a concurrent one."""
+    failing = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=2)
+    passing = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=2)
+    record_quiz_result = quiz_manager.db.record_quiz_result
+    
+    async def record_or_fail(**kwargs):
+        if kwargs['correct_answers'] == 0:
+            # Yield so the other submit runs while this one has writes pending
+            await asyncio.sleep(0.01)
+            raise RuntimeError("disk full")
+        return await record_quiz_result(**kwargs)
+    
+    monkeypatch.setattr(quiz_manager.db, "record_quiz_result", record_or_fail)
+    results = await asyncio.gather(
+        quiz_manager.submit_quiz(failing.quiz_id, ["wrong"] * 2),
+        quiz_manager.submit_quiz(passing.quiz_id, [q['correct_answer'] for q in passing.questions]),
+        return_exceptions=True
+    )
+    assert isinstance(results[0], RuntimeError)
+    assert results[1]['correct_answers'] == 2
+    
+    # Only the successful submit was kept, in full
+    stats = await quiz_manager.db.get_progress_stats()
+    assert stats['total_correct'] == 2
+    assert stats['total_incorrect'] == 0
+    assert len(await quiz_manager.db.get_quiz_history(limit=5)) == 1
+    assert quiz_manager.get_active_quiz(failing.quiz_id) is not None
+
+
 @pytest.mark.asyncio
 async def test_format_quiz_for_display(quiz_manager):
     """Test formatting quiz for display."""
@@ -295,6 +376,20 @@ async def test_format_quiz_for_display(quiz_manager):
     assert "Question 2:" in formatted
 
 
+@pytest.mark.asyncio
+async def test_format_quiz_stream(quiz_manager):
+    """Test streamed quiz sections join to the full display text."""
+    quiz = await quiz_manager.generate_multiple_choice_quiz(hsk_level=1, num_questions=3)
+    
+    sections = list(quiz_manager.format_quiz_stream(quiz))
+    
+    # Header, one block per question, footer
+    assert len(sections) == 5
+    assert sections[1].startswith("**Question 1:**")
+    assert "Choices:" in sections[1]
+    assert "".join(sections) == quiz_manager.format_quiz_for_display(quiz)
+
+
 @pytest.mark.asyncio
 async def test_format_results_for_display(quiz_manager):
     """Test formatting quiz results for display."""
@@ -310,6 +405,26 @@ async def test_format_results_for_display(quiz_manager):
     assert "Detailed Results:" in formatted
 
 
+@pytest.mark.asyncio
+async def test_format_results_grade_thresholds(quiz_manager):
+    """Test grades change at 50, 70 and 90 percent."""
+    def grade_for(score):
+        results = {
+            "score_percentage": score,
+            "correct_answers": 0,
+            "total_questions": 0,
+            "duration_seconds": 0,
+            "results": []
+        }
+        return quiz_manager.format_results_for_display(results)
+    
+    assert "Keep practicing!" in grade_for(49.9)
+    assert "Not bad!" in grade_for(50.0)
+    assert "Good job!" in grade_for(89.9)
+    assert "Excellent!" in grade_for(90.0)
+    assert "Excellent!" in grade_for(100.0)
+
+
 @pytest.mark.asyncio
 async def test_get_active_quiz(quiz_manager):
     """Test retrieving active quiz."""
@@ -321,4 +436,48 @@ async def test_get_active_quiz(quiz_manager):
     
     # Non-existent quiz should return None
     non_existent = quiz_manager.get_active_quiz("fake-id")
-    assert non_existent is None
\ No newline at end of file
+    assert non_existent is None
+
+
+@pytest.mark.asyncio
+async def test_quiz_generation_reuses_vocabulary_cache(quiz_manager):
+    """Test repeated quizzes are served from one vocabulary load, even across submissions."""
+    quiz = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=2)
+    cache = quiz_manager.db._vocab_cache
+    assert cache is not None
+    
+    # Progress writes don't touch vocabulary, so the cache survives them
+    await quiz_manager.submit_quiz(quiz.quiz_id, ["hello", "wrong"])
+    await quiz_manager.generate_multiple_choice_quiz(hsk_level=1, num_questions=2)
+    assert quiz_manager.db._vocab_cache is cache
+
+
+@pytest.mark.asyncio
+async def test_active_quizzes_capped(quiz_manager, monkeypatch):
+    """Test the oldest active quiz is dropped once the cap is reached."""
+    monkeypatch.setattr(testing, "MAX_ACTIVE_QUIZZES", 2)
+    
+    first = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=1)
+    second = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=1)
+    third = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=1)
+    
+    assert list(quiz_manager.active_quizzes) == [second.quiz_id, third.quiz_id]
+    with pytest.raises(ValueError, match="not found"):
+        await quiz_manager.submit_quiz(first.quiz_id, ["hello"])
+
+
+@pytest.mark.asyncio
+async def test_active_quiz_expires(quiz_manager, monkeypatch):
+    """Test quizzes older than the TTL can no longer be fetched or submitted."""
+    quiz = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=1)
+    assert quiz_manager.get_active_quiz(quiz.quiz_id) is quiz
+    
+    monkeypatch.setattr(testing, "QUIZ_TTL_SECONDS", -1)
+    assert quiz_manager.get_active_quiz(quiz.quiz_id) is None
+    assert quiz.quiz_id not in quiz_manager.active_quizzes
+    
+    # Expired quizzes are also swept when a new one is created
+    stale = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=1)
+    fresh = await quiz_manager.generate_translation_quiz(hsk_level=1, num_questions=1)
+    assert stale.quiz_id not in quiz_manager.active_quizzes
+    assert fresh.quiz_id in quiz_manager.active_quizzes
@@ -9,19 +9,24 @@ These tests verify:
 """
 
 import pytest
-import os
 from mandarin_mcp_server.database import MandarinDatabase
-from mandarin_mcp_server.vocabulary import VocabularyManager
+from mandarin_mcp_server.vocabulary import VocabularyManager, _REVIEW_BY_LEVEL_SQL
+from tests.seed_data import SEED_VOCAB
+
+
+# Seed vocab plus HSK 2 words for level filtering
+_TEST_VOCAB = SEED_VOCAB + (
+    ("非常", "fēicháng", "very", 2, "adverb", None),
+    ("但是", "dànshì", "but", 2, "conjunction", None),
+    ("因为", "yīnwèi", "because", 2, "conjunction", None),
+)
 
 
 @pytest.fixture
 async def vocab_manager():
     """Fixture that provides vocab manager with test data."""
-    db_path = "test_vocab.db"
-    
-    # Remove existing test database
-    if os.path.exists(db_path):
-        os.remove(db_path)
+    # In-memory database: nothing touches disk and there is nothing to clean up
+    db_path = ":memory:"
     
     # Create database and manager
     db = MandarinDatabase(db_path)
@@ -29,19 +34,7 @@ async def vocab_manager():
     await db.initialise_schema()
     
     # Add test vocab
-    test_vocab = [
-        ("你好", "nǐ hǎo", "hello", 1, "greeting"),
-        ("谢谢", "xièxie", "thank you", 1, "expression"),
-        ("再见", "zàijiàn", "goodbye", 1, "greeting"),
-        ("学生", "xuésheng", "student", 1, "noun"),
-        ("老师", "lǎoshī", "teacher", 1, "noun"),
-        ("非常", "fēicháng", "very", 2, "adverb"),
-        ("但是", "dànshì", "but", 2, "conjunction"),
-        ("因为", "yīnwèi", "because", 2, "conjunction"),
-    ]
-    
-    for chinese, pinyin, english, level, word_type in test_vocab:
-        await db.add_vocabulary(chinese, pinyin, english, level, word_type)
+    await db.add_vocabulary_bulk(_TEST_VOCAB)
     
     manager = VocabularyManager(db)
     
@@ -49,8 +42,6 @@ async def vocab_manager():
     
     # Cleanup
     await db.close()
-    if os.path.exists(db_path):
-        os.remove(db_path)
 
 
 @pytest.mark.asyncio
@@ -62,6 +53,19 @@ async def test_get_new_vocabulary(vocab_manager):
     assert all(v['hsk_level'] == 1 for v in new_vocab)
 
 
+@pytest.mark.asyncio
+async def test_get_new_vocabulary_including_learned(vocab_manager):
+    """Test both branches of get_new_vocabulary return plain dicts."""
+    all_vocab = await vocab_manager.db.get_vocabulary_by_hsk_level(1)
+    await vocab_manager.db.update_progress(all_vocab[0]['id'], correct=True)
+    
+    vocab = await vocab_manager.get_new_vocabulary(hsk_level=1, count=10, exclude_learned=False)
+    
+    assert len(vocab) == 5
+    assert all(type(v) is dict for v in vocab)
+    assert {v['id'] for v in vocab} == {row['id'] for row in all_vocab}
+
+
 @pytest.mark.asyncio
 async def test_get_new_vocabulary_excludes_learned(vocab_manager):
     """Test that learned vocab is excluded when requested."""
@@ -78,9 +82,7 @@ async def test_get_new_vocabulary_excludes_learned(vocab_manager):
     )
     
     # The learned word should not be in the results
-    learned_ids = {first_word['id']}
-    new_ids = {v['id'] for v in new_vocab}
-    assert learned_ids.isdisjoint(new_ids)
+    assert all(v['id'] != first_word['id'] for v in new_vocab)
 
 
 @pytest.mark.asyncio
@@ -111,6 +113,25 @@ async def test_search_vocabulary_with_hsk_filter(vocab_manager):
     assert results[0]['hsk_level'] == 2
 
 
+@pytest.mark.asyncio
+async def test_search_vocabulary_full_text(vocab_manager):
+    """Test longer terms match substrings through the full-text index."""
+    # Mid-word substring, case-insensitive
+    results = await vocab_manager.search_vocabulary("ACHE")
+    assert [v['english'] for v in results] == ["teacher"]
+    
+    results = await vocab_manager.search_vocabulary("you", hsk_level=1)
+    assert [v['chinese'] for v in results] == ["谢谢"]
+    
+    # FTS5 syntax in the term is matched literally rather than parsed
+    assert await vocab_manager.search_vocabulary('he" OR "') == []
+    
+    # Words added later are indexed by trigger
+    await vocab_manager.db.add_vocabulary("朋友", "péngyou", "friend", 1, "noun")
+    results = await vocab_manager.search_vocabulary("friend")
+    assert [v['chinese'] for v in results] == ["朋友"]
+
+
 @pytest.mark.asyncio
 async def test_get_vocabulary_by_word_type(vocab_manager):
     """Test filtering vocab by word type."""
@@ -134,6 +155,11 @@ async def test_get_vocabulary_statistics(vocab_manager):
     assert 'greeting' in stats['word_type_counts']
     assert stats['learned_vocabulary'] == 0
     assert stats['new_vocabulary'] == 8
+    
+    # Levels in order and word types most common first
+    assert list(stats['hsk_level_counts']) == [1, 2]
+    type_counts = list(stats['word_type_counts'].values())
+    assert type_counts == sorted(type_counts, reverse=True)
 
 
 @pytest.mark.asyncio
@@ -141,8 +167,7 @@ async def test_get_vocabulary_statistics_with_progress(vocab_manager):
     """Test statistics with some learned vocab."""
     # Mark two words as learned
     all_vocab = await vocab_manager.db.get_vocabulary_by_hsk_level(1, limit=2)
-    for vocab in all_vocab:
-        await vocab_manager.db.update_progress(vocab['id'], correct=True)
+    await vocab_manager.db.record_quiz_answers([(vocab['id'], True) for vocab in all_vocab])
     
     stats = await vocab_manager.get_vocabulary_statistics()
     assert stats['learned_vocabulary'] == 2
@@ -167,10 +192,12 @@ async def test_get_vocabulary_by_mastery(vocab_manager):
     # First, create some progress
     all_vocab = await vocab_manager.db.get_vocabulary_by_hsk_level(1, limit=3)
     
-    # Set different mastery levels
-    await vocab_manager.db.update_progress(all_vocab[0]['id'], correct=True)  # mastery 1
-    await vocab_manager.db.update_progress(all_vocab[0]['id'], correct=True)  # mastery 2
-    await vocab_manager.db.update_progress(all_vocab[1]['id'], correct=False) # mastery 0
+    # Set different mastery levels in one batch; answers apply in order
+    await vocab_manager.db.record_quiz_answers([
+        (all_vocab[0]['id'], True),   # mastery 1
+        (all_vocab[0]['id'], True),   # mastery 2
+        (all_vocab[1]['id'], False),  # mastery 0
+    ])
     
     # Get words at mastery level 2
     mastery2_words = await vocab_manager.get_vocabulary_by_mastery(mastery_level=2)
@@ -216,11 +243,52 @@ async def test_get_vocabulary_for_review(vocab_manager):
     await vocab_manager.db.update_progress(all_vocab[0]['id'], correct=True)
     
     await vocab_manager.db._connection.execute(
-        "UPDATE user_progress SET next_review = datetime('now', '-1 day') WHERE vocabulary_id = ?",
-        (all_vocab[0]['id'],)
+        "UPDATE user_progress SET next_review = ? WHERE vocabulary_id = ?",
+        ("2000-01-01 00:00:00", all_vocab[0]['id'])
     )
     await vocab_manager.db._connection.commit()
     
     # Now should return the word
     due_words = await vocab_manager.get_vocabulary_for_review()
-    assert len(due_words) >= 1
\ No newline at end of file
+    assert len(due_words) >= 1
+    
+    # Level filter applies on top of the due check, with the same columns
+    level_due = await vocab_manager.get_vocabulary_for_review(hsk_level=1)
+    assert level_due == due_words
+    assert await vocab_manager.get_vocabulary_for_review(hsk_level=2) == []
+
+
+@pytest.mark.asyncio
+async def test_review_by_level_walks_due_index(vocab_manager):
+    """Test the level-filtered review query is driven by the due-review index."""
+    cursor = await vocab_manager.db._connection.execute(
+        "EXPLAIN QUERY PLAN " + _REVIEW_BY_LEVEL_SQL,
+        (1, "2000-01-01 00:00:00", 10)
+    )
+    plan = " ".join(row[3] for row in await cursor.fetchall())
+    
+    assert "INDEX idx_progress_due" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_reads_use_reader_pool(tmp_path):
+    """Test manager reads go through reader connections, not the writer."""
+    db = MandarinDatabase(tmp_path / "test_readers.db")
+    await db.connect()
+    await db.initialise_schema()
+    manager = VocabularyManager(db)
+    
+    try:
+        async with db.transaction():
+            # Uncommitted on the writer, so only the writer connection can see it
+            await db.add_vocabulary("朋友", "péngyou", "friend", 1, "noun")
+            
+            assert await manager.search_vocabulary("friend") == []
+            assert await manager.search_vocabulary("朋") == []
+            assert await manager.get_vocabulary_by_word_type("noun") == []
+            assert await manager.get_random_vocabulary(hsk_level=1) == []
+        
+        assert [v['chinese'] for v in await manager.search_vocabulary("friend")] == ["朋友"]
+    finally:
+        await db.close()